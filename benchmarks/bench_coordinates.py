@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+"""
+Time plotter coordinate setup for growing row counts
+
+    $ python -m benchmarks.bench_coordinates
+
+Time per row should stay flat as the number of rows grows
+"""
+import time
+
+from catplot.coordinates import coordinates
+
+from .synthetic import payroll
+
+
+def main():
+    print(f"{'rows':>10} {'seconds':>10} {'ns/row':>10}")
+    for rows in (10**3, 10**4, 10**5, 4 * 10**5, 10**6):
+        df = payroll(rows)
+        start = time.perf_counter()
+        coordinates(df, 'Institution', hue='Kön')
+        elapsed = time.perf_counter() - start
+        print(f"{rows:>10} {elapsed:>10.4f} {1e9 * elapsed / rows:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
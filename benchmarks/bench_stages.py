@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Time each stage of a plot run on synthetic exports of growing size
+
+    $ python -m benchmarks.bench_stages --rows 1e3 1e4 1e5 1e6 -o HEAD.json
+    $ python -m benchmarks.compare BASE.json HEAD.json
+
+Stages are timed in process, best of --repeat runs, and written as json
+together with the commit and library versions
+"""
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from catplot import corrections, main as catplot, stats  # noqa: E402
+from catplot.plotters import plotters  # noqa: E402
+from catplot.util import process_filters  # noqa: E402
+
+from . import synthetic  # noqa: E402
+
+ROOT = pathlib.Path(__file__).parents[1]
+FILTERS = ['Benämning@LEKTOR:PROFESSOR:FORSKARE', 'Födelseår>1960']
+STAGES = (
+    'process_data', 'corrections', 'process_filters', 'construct', 'plot',
+    'table', 'savefig',
+)
+
+
+def best(function, repeat):
+    """
+    Returns the last result and least wall time of repeated calls
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds = min(seconds, time.perf_counter() - start)
+    return result, seconds
+
+
+def run_stages(directory, plot_type='box', repeat=3):
+    """
+    Returns seconds and output rows per stage for the export in directory
+    """
+    data, korr = directory / 'export.csv', directory / 'korr.csv'
+    results = {}
+
+    def record(stage, function, reps=repeat):
+        result, seconds = best(function, reps)
+        rows = len(result) if isinstance(result, pd.DataFrame) else None
+        results[stage] = dict(seconds=seconds, output_rows=rows)
+        return result
+
+    raw = record('process_data', lambda: catplot.process_data(str(data)))
+    df = record(
+        'corrections',
+        lambda: corrections.Corrections.read(korr).apply(raw.copy()),
+    )
+    df = record('process_filters', lambda: process_filters(df, FILTERS))
+
+    def construct():
+        return plotters[plot_type](
+            df.copy(), 'Månadslön', categorical='Skola', hue='Kön',
+            annotate=('Förnamn', 'Efternamn'),
+        )
+
+    plotter = record('construct', construct)
+    results['construct']['output_rows'] = len(df)
+
+    def plot():
+        plt.close('all')
+        plotter.plot(title='benchmark')
+        return plotter.df
+
+    record('plot', plot, reps=1)
+    # Plotter.table is cached, time the computation itself
+    record('table', lambda: stats.table(
+        plotter.df, 'Månadslön', categorical='Skola', hue='Kön',
+    ))
+    record(
+        'savefig',
+        lambda: plt.gcf().savefig(directory / 'figure.png'),
+        reps=1,
+    )
+    plt.close('all')
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return dict(
+        commit=commit,
+        date=datetime.datetime.now().isoformat(timespec='seconds'),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        numpy=np.__version__,
+        pandas=pd.__version__,
+        matplotlib=matplotlib.__version__,
+    )
+
+
+def get_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--rows', nargs='+', type=float, default=[1e3, 1e4, 1e5],
+        help='Export sizes, up to 1e7'
+    )
+    parser.add_argument('--plot-type', default='box', choices=plotters)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='Results json file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = get_args(argv)
+    results = []
+    print(f"{'rows':>10} {'stage':<16} {'seconds':>10}", file=sys.stderr)
+    for rows in map(int, args.rows):
+        with tempfile.TemporaryDirectory() as directory:
+            directory = pathlib.Path(directory)
+            synthetic.write(directory, rows, seed=args.seed)
+            stages = run_stages(directory, args.plot_type, args.repeat)
+        for stage in STAGES:
+            results.append(dict(rows=rows, stage=stage, **stages[stage]))
+            print(
+                f"{rows:>10} {stage:<16} {stages[stage]['seconds']:>10.4f}",
+                file=sys.stderr,
+            )
+    report = dict(
+        meta=dict(metadata(), plot_type=args.plot_type, seed=args.seed),
+        results=results,
+    )
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Import time per module and CLI startup time
+
+    $ python -m benchmarks.bench_startup [--json]
+
+Each module is imported in a fresh interpreter with -X importtime and the
+cumulative import time reported
+"""
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).parents[1]
+MODULES = [
+    'catplot.main',
+    'catplot.util',
+    'catplot.stats',
+    'catplot.cache',
+    'catplot.plotters',
+    'catplot.batch',
+    'catplot.demos',
+]
+
+
+def environment():
+    return {**os.environ, 'PYTHONPATH': str(ROOT), 'MPLBACKEND': 'Agg'}
+
+
+def import_time(module):
+    """
+    Returns cumulative import time of module in seconds
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=environment(), capture_output=True, text=True, check=True,
+    )
+    for line in reversed(result.stderr.splitlines()):
+        fields = [f.strip() for f in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1e6
+    raise ValueError(f'No import time for {module}')
+
+
+def startup_time(args=('--help',), repeat=5):
+    """
+    Returns best wall time of running the command line tool
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-m', 'catplot', *args], env=environment(),
+            stdout=subprocess.DEVNULL, check=True,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    results = {module: import_time(module) for module in MODULES}
+    results['catplot --help'] = startup_time()
+    if '--json' in sys.argv:
+        print(json.dumps(results, indent=2))
+        return
+    for name, seconds in results.items():
+        print(f"{name:<20} {seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Compare a full box plot run with a --table-only run
+
+    $ python -m benchmarks.bench_table_only [rows]
+
+Each run is a fresh process, so the times include interpreter startup and
+imports as in a nightly job
+"""
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+from .synthetic import payroll
+
+ROOT = pathlib.Path(__file__).parents[1]
+
+
+def run(args, cwd, repeat=3):
+    env = {**os.environ, 'PYTHONPATH': str(ROOT), 'MPLBACKEND': 'Agg'}
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-m', 'catplot', *args], cwd=cwd, env=env,
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as cwd:
+        payroll(rows).to_csv(pathlib.Path(cwd) / 'export.csv', index=False)
+        common = [
+            '--data', 'export.csv', '--num', 'Månadslön', '--cat',
+            'Institution', '--hue', 'Kön', '--no-cache',
+        ]
+        full = run([*common, '--plot-type', 'box'], cwd)
+        table = run([*common, '--table-only'], cwd)
+        startup = run(['--help'], cwd)
+    print(f"rows            {rows}")
+    print(f"startup (s)     {startup:.3f}")
+    print(f"box plot (s)    {full:.3f}")
+    print(f"table-only (s)  {table:.3f}")
+    print(f"speedup         {full / table:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
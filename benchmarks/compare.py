@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Compare two bench_stages result files
+
+    $ python -m benchmarks.compare BASE.json HEAD.json --threshold 1.2
+
+Prints the time ratio per size and stage, exits with status 1 if a stage got
+slower than the threshold ratio
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report['meta'], {
+        (r['rows'], r['stage']): r['seconds'] for r in report['results']
+    }
+
+
+def compare(base, head):
+    """
+    Returns (rows, stage, base seconds, head seconds, ratio) of common stages
+    """
+    return [
+        (rows, stage, base[rows, stage], seconds, seconds / base[rows, stage])
+        for (rows, stage), seconds in head.items()
+        if (rows, stage) in base and base[rows, stage] > 0
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument(
+        '--threshold', type=float, default=1.2,
+        help='Fail when head/base time exceeds this ratio'
+    )
+    parser.add_argument(
+        '--min-seconds', type=float, default=0.005,
+        help='Ignore stages faster than this in both runs'
+    )
+    args = parser.parse_args(argv)
+
+    base_meta, base = load(args.base)
+    head_meta, head = load(args.head)
+    print(f"base {base_meta.get('commit')}  head {head_meta.get('commit')}")
+    print(f"{'rows':>10} {'stage':<16} {'base':>9} {'head':>9} {'ratio':>7}")
+    slower = []
+    for rows, stage, before, after, ratio in compare(base, head):
+        flag = ''
+        if ratio > args.threshold and after > args.min_seconds:
+            flag = ' *'
+            slower.append((rows, stage))
+        print(
+            f"{rows:>10} {stage:<16} {before:>9.4f} {after:>9.4f}"
+            f" {ratio:>7.2f}{flag}"
+        )
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
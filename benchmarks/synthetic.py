@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Deterministic synthetic payroll exports for benchmarks
+
+    $ python -m benchmarks.synthetic 1000000 export.csv
+
+Columns and cardinalities follow a typical HR export: a few schools, a
+hundred departments, tens of job titles with a skewed distribution, two
+genders, thousands of first and last names and employment dates. The same
+rows and seed always give the same data.
+"""
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+
+SCHOOLS = ['ABE', 'CBH', 'EECS', 'ITM', 'SCI']
+GENDERS = ['Kvinna', 'Man']
+TITLES = [
+    'ADJUNKT', 'AMANUENS', 'BITR LEKTOR', 'DOKTORAND', 'FORSKARE',
+    'FORSKNINGSINGENJÖR', 'LEKTOR', 'POSTDOKTOR', 'PROFESSOR',
+] + [f'TITEL {i}' for i in range(51)]
+FIRST_NAMES = 2_000
+LAST_NAMES = 5_000
+
+
+def names(prefix, count):
+    return np.array([f'{prefix}{i:05d}' for i in range(count)], dtype=object)
+
+
+def skewed(rng, count, rows, exponent=1.2):
+    """
+    Returns codes 0..count-1 with Zipf-like frequencies
+    """
+    weights = 1 / np.arange(1, count + 1) ** exponent
+    return rng.choice(count, rows, p=weights / weights.sum())
+
+
+def payroll(rows, seed=0):
+    """
+    Returns a synthetic export of rows employees
+    """
+    rng = np.random.default_rng(seed)
+    title = skewed(rng, len(TITLES), rows)
+    school = rng.integers(0, len(SCHOOLS), rows)
+    department = school * 20 + rng.integers(0, 20, rows)
+    gender = rng.integers(0, len(GENDERS), rows)
+    salary = (
+        25_000 + 2_000 * (len(TITLES) - title) / 10
+        + rng.gamma(4, 3_000, rows)
+    ).round(-2).astype(np.int64)
+    start = pd.Timestamp('2000-01-01') + pd.to_timedelta(
+        rng.integers(0, 8_000, rows), unit='D'
+    )
+    end = start + pd.to_timedelta(rng.integers(30, 4_000, rows), unit='D')
+    return pd.DataFrame({
+        'Månadslön': salary,
+        'Skola': np.array(SCHOOLS, dtype=object)[school],
+        'Institution': np.array(
+            [f'{s}/{i:02d}' for s in SCHOOLS for i in range(20)], dtype=object
+        )[department],
+        'Kön': np.array(GENDERS, dtype=object)[gender],
+        'Benämning': np.array(TITLES, dtype=object)[title],
+        'Förnamn': names('F', FIRST_NAMES)[
+            skewed(rng, FIRST_NAMES, rows, 0.8)
+        ],
+        'Efternamn': names('E', LAST_NAMES)[
+            skewed(rng, LAST_NAMES, rows, 0.8)
+        ],
+        'Födelseår': rng.integers(1950, 2000, rows),
+        'Bef fr': start.strftime('%Y-%m-%d'),
+        'Bef tom': end.strftime('%Y-%m-%d'),
+    })
+
+
+def corrections(df, count, seed=0):
+    """
+    Returns a korr.csv table of count salary and title corrections
+    """
+    rng = np.random.default_rng(seed + 1)
+    index = rng.choice(len(df), min(count, len(df)), replace=False)
+    salary = rng.random(len(index)) < 0.5
+    return pd.DataFrame({
+        'index': index,
+        'column': np.where(salary, 'Månadslön', 'Benämning'),
+        'value': np.where(
+            salary,
+            (df['Månadslön'].to_numpy()[index] + 100).astype(str),
+            'LEKTOR',
+        ),
+    })
+
+
+def write(directory, rows, seed=0, corrections_per_row=0.001):
+    """
+    Write export.csv and korr.csv of rows to directory, returns their paths
+    """
+    directory = pathlib.Path(directory)
+    df = payroll(rows, seed)
+    data = directory / 'export.csv'
+    korr = directory / 'korr.csv'
+    df.to_csv(data, index=False)
+    corrections(df, max(int(rows * corrections_per_row), 1), seed).to_csv(
+        korr, index=False
+    )
+    return data, korr
+
+
+def main():
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10_000
+    path = sys.argv[2] if len(sys.argv) > 2 else 'export.csv'
+    payroll(rows).to_csv(path, index=False)
+
+
+if __name__ == "__main__":
+    main()
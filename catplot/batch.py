@@ -0,0 +1,90 @@
+"""
+Render many plots from one data load
+
+A manifest is a json list of plot specs, or an object with a "plots" list.
+Each spec holds settings as on the command line, e.g.
+
+    [
+        {"plot_type": "box", "num": "Månadslön", "cat": "Skola"},
+        {"plot_type": "box", "num": "Månadslön", "cat": "Kön",
+         "filters": ["Skola=CBH"]}
+    ]
+
+Spec settings override the common settings, filters are appended to them.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import json
+import multiprocessing
+import os
+
+_data = None
+
+
+def read_manifest(manifest):
+    """
+    Returns list of plot specs in a json manifest file
+    """
+    with open(manifest) as f:
+        specs = json.load(f)
+    if isinstance(specs, dict):
+        specs = specs['plots']
+    return specs
+
+
+def plot_settings(cfg, spec):
+    """
+    Returns settings of a single plot, spec overriding common settings
+    """
+    from .main import num_setting
+
+    # a common figure file would be overwritten by every spec
+    common = {k: v for k, v in cfg.items() if k != 'savefig'}
+    settings = {**common, **spec}
+    settings['filters'] = cfg.get('filters', []) + spec.get('filters', [])
+    settings.pop('batch', None)
+    settings.pop('display', None)
+    if settings.get('num'):
+        settings['num'] = num_setting(settings['num'])
+    return settings
+
+
+def run_batch(cfg, manifest, jobs=None):
+    """
+    Load and correct data once, render the manifest specs in parallel
+
+    Returns the (figure, table) file names of each spec
+    """
+    from .main import load_data
+
+    specs = [plot_settings(cfg, spec) for spec in read_manifest(manifest)]
+    df = load_data(cfg, specs)
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = None
+    jobs = min(jobs or os.cpu_count(), len(specs)) or 1
+    with ProcessPoolExecutor(
+        jobs, mp_context=context, initializer=_init, initargs=(df,)
+    ) as pool:
+        return list(pool.map(_render, specs))
+
+
+def _init(df):
+    """
+    Worker setup: non-interactive backend and shared data
+    """
+    global _data
+    import matplotlib
+    matplotlib.use('Agg')
+    _data = df
+
+
+def _render(settings):
+    from .main import render
+    import matplotlib.pyplot as plt
+
+    try:
+        return render(_data, settings)
+    finally:
+        plt.close('all')
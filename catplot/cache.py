@@ -0,0 +1,190 @@
+"""
+On-disk cache of parsed data files
+"""
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+import threading
+
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 1024 ** 3
+CHUNK = 1024 ** 2
+
+
+def default_directory():
+    """
+    Returns cache directory, $CATPLOT_CACHE or catplot under the user cache
+    """
+    if os.getenv('CATPLOT_CACHE'):
+        return pathlib.Path(os.getenv('CATPLOT_CACHE'))
+    base = os.getenv('XDG_CACHE_HOME', pathlib.Path.home() / '.cache')
+    return pathlib.Path(base) / 'catplot'
+
+
+def content_hash(path):
+    """
+    Returns hex digest of file contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def has_feather():
+    """
+    Feather files require pyarrow
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class DataCache:
+    """
+    Parsed DataFrames stored in a binary columnar format
+
+    Entries are keyed by source path, size, modification time and content
+    hash of the source file, plus an optional tag for derived frames.
+    Least recently used entries are evicted when the total size exceeds
+    max_bytes. Entries may be loaded from several threads, and entries
+    removed by another thread or process are treated as misses.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = pathlib.Path(directory or default_directory())
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+    def key(self, path, tag=''):
+        """
+        Returns cache key of a source file
+        """
+        path = pathlib.Path(path).resolve()
+        stat = path.stat()
+        fields = (
+            str(path), str(stat.st_size), str(stat.st_mtime_ns),
+            content_hash(path), tag,
+        )
+        return hashlib.blake2b(
+            '\0'.join(fields).encode(), digest_size=16
+        ).hexdigest()
+
+    def entries(self, key):
+        """
+        Returns possible cache files for a key
+        """
+        return [self.directory / f'{key}.{ext}' for ext in ('feather', 'pkl')]
+
+    def get(self, key):
+        """
+        Returns cached frame, None on a miss
+        """
+        for entry in self.entries(key):
+            if entry.exists():
+                try:
+                    df = self.read(entry)
+                    os.utime(entry)
+                except FileNotFoundError:
+                    return None
+                except Exception:
+                    entry.unlink(missing_ok=True)
+                    return None
+                return df
+        return None
+
+    def put(self, key, df):
+        """
+        Store frame and evict old entries
+
+        Frames pyarrow cannot convert, e.g. object columns of mixed types,
+        are pickled. The cache is optional, nothing is stored if writing
+        fails.
+        """
+        feather, pickled = self.entries(key)
+        written = (
+            has_feather() and self.feather_compatible(df)
+            and self.write(feather, df.to_feather)
+        ) or self.write(pickled, lambda tmp: self.pickle(df, tmp))
+        if written:
+            with self.lock:
+                self.evict()
+
+    def write(self, entry, writer):
+        """
+        Write entry with writer(path) through a temporary file, False if
+        it failed
+        """
+        tmp = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            os.close(fd)
+            writer(tmp)
+            os.replace(tmp, entry)
+        except Exception:
+            return False
+        finally:
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+        return True
+
+    @staticmethod
+    def pickle(df, path):
+        with open(path, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self, path, reader, tag='', refresh=False):
+        """
+        Returns reader(path) from the cache, parsing and storing on a miss
+        """
+        key = self.key(path, tag)
+        df = None if refresh else self.get(key)
+        if df is None:
+            df = reader(path)
+            self.put(key, df)
+        return df
+
+    def evict(self):
+        """
+        Remove least recently used entries until within max_bytes
+        """
+        entries = []
+        for entry in self.directory.iterdir():
+            if entry.suffix == '.tmp':
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort(key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        while entries and total > self.max_bytes:
+            _, size, entry = entries.pop(0)
+            total -= size
+            entry.unlink(missing_ok=True)
+
+    @staticmethod
+    def read(entry):
+        if entry.suffix == '.feather':
+            return pd.read_feather(entry)
+        with open(entry, 'rb') as f:
+            return pickle.load(f)
+
+    @staticmethod
+    def feather_compatible(df):
+        """
+        Feather stores string column names and a default index only
+        """
+        return (
+            all(isinstance(c, str) for c in df.columns)
+            and isinstance(df.index, pd.RangeIndex)
+            and df.index.start == 0 and df.index.step == 1
+        )
@@ -0,0 +1,103 @@
+"""
+Vectorized plot coordinates from categorical codes
+"""
+import numpy as np
+import pandas as pd
+
+
+def category_codes(values, labels):
+    """
+    Returns the position of each value in labels as an integer array,
+    -1 for missing values or values not among the labels
+
+    >>> category_codes(['b', None, 'a'], ['a', 'b']).tolist()
+    [1, -1, 0]
+    """
+    if isinstance(labels, str):
+        labels = [labels]
+    labels = list(labels)
+    if isinstance(values, pd.Series):
+        values = values.array
+    if isinstance(values, pd.Categorical):
+        if list(values.categories) == labels:
+            return values.codes.astype(np.int64)
+    codes = pd.Categorical(values, categories=labels).codes
+    return codes.astype(np.int64)
+
+
+def sorted_labels(values):
+    """
+    Returns the sorted distinct non-null values
+
+    Categorical values are given in category order, unobserved categories
+    left out
+    """
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories
+        codes = values.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+        return list(categories[np.flatnonzero(counts)])
+    return sorted(values.dropna().unique())
+
+
+def categorize(values, order=None):
+    """
+    Returns values as a categorical of strings, categories in order or the
+    sorted distinct values
+
+    Values not in order become missing. Categorical values are recoded
+    without converting the values again.
+
+    >>> categorize(pd.Series([2, 1, None])).cat.categories.tolist()
+    ['1.0', '2.0']
+    """
+    values = pd.Series(values)
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = pd.factorize(values)
+        labels = pd.Index(uniques).astype(str)
+        if not labels.is_unique:
+            # e.g. 1 and '1', convert every value
+            codes, labels = pd.factorize(values.astype(str).where(codes >= 0))
+        values = pd.Series(
+            pd.Categorical.from_codes(codes, labels), index=values.index,
+            name=values.name,
+        )
+    categories = values.cat.categories
+    if not all(isinstance(c, str) for c in categories):
+        values = values.cat.rename_categories(categories.astype(str))
+    if order is None:
+        order = sorted(values.cat.categories)
+    if list(values.cat.categories) != list(order):
+        values = values.cat.set_categories(list(order))
+    return values
+
+
+def level_shift(values, labels=None):
+    """
+    Returns offsets of subcategory (hue) levels within a category slot
+
+    With n levels the slot is 0.8 wide and level i is centered at
+    (i - (n - 1)/2) * 0.8/n
+    """
+    if labels is None:
+        labels = sorted_labels(values)
+    multiplicity = len(labels)
+    level = (multiplicity - 1) / 2
+    return (category_codes(values, labels) - level) * 0.8 / multiplicity
+
+
+def coordinates(df, categorical, labels=None, hue=None, hue_labels=None):
+    """
+    Returns expected coordinate along the categorical axis for each row
+    """
+    if categorical is None:
+        return pd.Series(np.zeros(len(df)), index=df.index)
+    if labels is None:
+        labels = sorted_labels(df[categorical])
+    values = pd.Series(
+        category_codes(df[categorical], labels), index=df.index
+    )
+    if hue:
+        values += level_shift(df[hue], hue_labels)
+    return values
@@ -0,0 +1,199 @@
+"""
+Corrections of known errors in the data
+
+A corrections file (korr.csv) lists single values to replace:
+
+    index,column,value
+    9,Skola,CBH
+
+Edits are grouped by column and applied with one assignment per column,
+values coerced to the dtype of the column.
+
+With data in several snapshot files an optional snapshot column names the
+file, the index is then the row of that file:
+
+    snapshot,index,column,value
+    2024-03,9,Skola,CBH
+
+Edits without a snapshot refer to rows of the concatenated data, and move
+when a file is added before others.
+"""
+from functools import lru_cache
+import hashlib
+import os
+import pathlib
+
+import numpy as np
+import pandas as pd
+
+from . import profile
+
+DEFAULT_FILE = 'korr.csv'
+SNAPSHOT = 'snapshot'
+
+
+class Corrections:
+    """
+    Value edits per column, indexed by row label, and the edits of each
+    snapshot file
+    """
+
+    def __init__(self, edits, digest='', snapshots=None):
+        self.edits = edits
+        self.digest = digest
+        self.snapshots = snapshots or {}
+
+    @classmethod
+    def read(cls, path):
+        """
+        Returns corrections of a csv file, the last of duplicate edits wins
+        """
+        table = pd.read_csv(
+            path, dtype=str, keep_default_na=False, skipinitialspace=True
+        )
+        table['index'] = table['index'].astype(np.int64)
+        if 'snapshot' not in table.columns:
+            table['snapshot'] = ''
+        table = table.drop_duplicates(
+            ['snapshot', 'index', 'column'], keep='last'
+        )
+        edits = {
+            snapshot: column_edits(group)
+            for snapshot, group in table.groupby('snapshot', sort=False)
+        }
+        with open(path, 'rb') as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        snapshots = {
+            snapshot: cls(values) for snapshot, values in edits.items()
+            if snapshot
+        }
+        return cls(edits.get('', {}), digest, snapshots)
+
+    def snapshot(self, name):
+        """
+        Returns corrections of the rows of a snapshot file, None if none
+        """
+        return self.snapshots.get(name)
+
+    def __len__(self):
+        return sum(len(values) for values in self.edits.values()) + sum(
+            len(corrections) for corrections in self.snapshots.values()
+        )
+
+    def apply(self, df, columns=None):
+        """
+        Apply edits to df in place, restricted to columns if given
+
+        Edits of columns or rows not in df are skipped. Edits of a snapshot
+        apply to the rows of df tagged with its name, counted from the first,
+        so df holds the whole files in sequence.
+        """
+        with profile.stage('corrections', rows=len(df)):
+            self._apply(df, columns)
+            if self.snapshots and SNAPSHOT in df.columns:
+                self._apply_snapshots(df, columns)
+            return df
+
+    def _apply_snapshots(self, df, columns):
+        for name, corrections in self.snapshots.items():
+            rows = df.index[(df[SNAPSHOT] == name).to_numpy()]
+            if rows.empty:
+                continue
+            corrections.moved(rows[0], len(rows))._apply(df, columns)
+
+    def moved(self, start, length):
+        """
+        Returns edits of rows below length, labels counted from start
+        """
+        edits = {}
+        for column, values in self.edits.items():
+            values = values[values.index < length]
+            edits[column] = pd.Series(
+                values.to_numpy(), index=values.index + start
+            )
+        return Corrections(edits, self.digest)
+
+    def _apply(self, df, columns):
+        for column, values in self.edits.items():
+            if column not in df.columns:
+                continue
+            if columns is not None and column not in columns:
+                continue
+            rows = df.index.isin(values.index)
+            if not rows.any():
+                continue
+            values = coerce(
+                values.reindex(df.index[rows]), df[column].dtype
+            )
+            if values.dtype != df[column].dtype:
+                df[column] = df[column].astype(
+                    common_type(df[column].dtype, values.dtype)
+                )
+            df.loc[rows, column] = values.to_numpy()
+        return df
+
+
+def column_edits(table):
+    """
+    Returns values of a corrections table per column, indexed by row
+    """
+    return {
+        column: pd.Series(group['value'].to_numpy(), index=group['index'])
+        for column, group in table.groupby('column', sort=False)
+    }
+
+
+def coerce(values, dtype):
+    """
+    Returns string values converted to dtype where possible
+
+    Integer columns with non-integral or missing values become float, values
+    that are not numbers leave a numerical column as strings
+    """
+    if isinstance(dtype, pd.CategoricalDtype):
+        if values.isin(dtype.categories).all():
+            return values.astype(dtype)
+        return values.astype(object)
+    if pd.api.types.is_bool_dtype(dtype):
+        booleans = values.str.lower().map({'true': True, 'false': False})
+        return values if booleans.isna().any() else booleans.astype(bool)
+    if pd.api.types.is_numeric_dtype(dtype):
+        numbers = pd.to_numeric(values, errors='coerce')
+        if (numbers.isna() & (values != '')).any():
+            return values.astype(object)
+        if pd.api.types.is_integer_dtype(dtype) and numbers.notna().all():
+            if (numbers == np.round(numbers)).all():
+                return numbers.astype(dtype)
+        return numbers.astype(float)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        dates = pd.to_datetime(values, errors='coerce')
+        return values if dates.isna().any() else dates
+    return values.astype(dtype)
+
+
+def common_type(dtype, other):
+    """
+    Returns a dtype holding values of both dtypes
+    """
+    try:
+        return np.result_type(dtype, other)
+    except TypeError:
+        return object
+
+
+@lru_cache(maxsize=8)
+def _read(path, size, mtime):
+    return Corrections.read(path)
+
+
+def load(path=DEFAULT_FILE):
+    """
+    Returns corrections of a file, None if there is none
+
+    The file is parsed once while unchanged
+    """
+    path = pathlib.Path(path)
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return _read(os.fspath(path.resolve()), stat.st_size, stat.st_mtime_ns)
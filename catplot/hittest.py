@@ -0,0 +1,78 @@
+"""
+Spatial index for mapping mouse positions to plotted data points
+"""
+import numpy as np
+
+
+class HitIndex:
+    """
+    Grid of sorted buckets over plotted points
+
+    Points are bucketed along the secondary axis in cells of the secondary
+    tolerance and sorted along the primary axis within each bucket. A query
+    visits at most three buckets and bisects each of them, so lookups are
+    logarithmic in the number of points.
+    """
+
+    def __init__(self, primary, secondary, primary_tol, secondary_tol):
+        primary = np.asarray(primary, dtype=float)
+        secondary = np.asarray(secondary, dtype=float)
+        self.primary_tol = primary_tol
+        self.secondary_tol = secondary_tol
+
+        valid = ~(np.isnan(primary) | np.isnan(secondary))
+        positions = np.flatnonzero(valid)
+        cells = np.floor(secondary[valid] / secondary_tol).astype(np.int64)
+        order = np.lexsort((positions, primary[valid], cells))
+
+        self.cells = cells[order]
+        self.primary = primary[valid][order]
+        self.secondary = secondary[valid][order]
+        self.positions = positions[order]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def query(self, primary, secondary):
+        """
+        Returns position of the nearest point strictly within tolerance,
+        None if there is no such point
+        """
+        if self.primary_tol <= 0 or not len(self):
+            return None
+
+        cell = int(np.floor(secondary / self.secondary_tol))
+        start, stop = np.searchsorted(
+            self.cells, [cell - 1, cell + 2], side='left'
+        )
+        best, best_distance = None, np.inf
+        for lo, hi in self._buckets(start, stop):
+            left, right = np.searchsorted(
+                self.primary[lo:hi],
+                [primary - self.primary_tol, primary + self.primary_tol],
+            )
+            candidates = slice(lo + left, lo + right)
+            dp = (self.primary[candidates] - primary) / self.primary_tol
+            ds = (self.secondary[candidates] - secondary) / self.secondary_tol
+            near = (np.abs(dp) < 1) & (np.abs(ds) < 1)
+            if not near.any():
+                continue
+            distance = dp ** 2 + ds ** 2
+            distance[~near] = np.inf
+            i = int(np.argmin(distance))
+            position = self.positions[candidates][i]
+            if distance[i] < best_distance or (
+                distance[i] == best_distance and position < best
+            ):
+                best, best_distance = position, distance[i]
+        return best
+
+    def _buckets(self, start, stop):
+        """
+        Yields (lo, hi) index ranges of the buckets between start and stop
+        """
+        lo = start
+        while lo < stop:
+            hi = np.searchsorted(self.cells, self.cells[lo], side='right')
+            yield lo, hi
+            lo = hi
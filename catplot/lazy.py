@@ -0,0 +1,28 @@
+"""
+Deferred imports of heavy modules
+"""
+import importlib
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access
+
+    >>> np = LazyModule('numpy')
+    >>> np.zeros(2).tolist()
+    [0.0, 0.0]
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+
+    def __getattr__(self, attr):
+        module = self.__dict__.get('_module')
+        if module is None:
+            # imported once, later lookups skip the import machinery
+            module = importlib.import_module(self._name)
+            self.__dict__['_module'] = module
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
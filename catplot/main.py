@@ -3,31 +3,268 @@
 Generate seaborn boxplots and strip plots with annotations
 """
 from configparser import ConfigParser
-import csv
+import concurrent.futures
+import contextvars
+import glob
+import math
 import os
 import re
 import json
-import pathlib
+import sys
 
-import matplotlib.pyplot as plt
-import pandas as pd
+from . import profile
+from .lazy import LazyModule
+from .util import (
+    compile_filters, process_filters, filter_dict, filter_values,
+)
 
-from .demos import boxplot_demo, pointplot_demo, stripplot_demo
-from .plotters import plotters
-from .util import process_filters, filter_values
+# imported on first use, --help and table-only runs skip matplotlib
+pd = LazyModule('pandas')
+plt = LazyModule('matplotlib.pyplot')
+np = LazyModule('numpy')
 
+SNAPSHOT = 'snapshot'
+LOAD_WORKERS = 4
 
-def process_data(data):
+
+def process_data(data, cache=None, refresh=False, columns=None,
+                 corrections=None):
+    """
+    Returns parsed data file, through the cache if given
+
+    If columns is given only those columns are returned. The cache holds
+    the parsed file, corrections are applied after loading so that editing
+    them does not parse the file again.
+    """
+    if cache is not None:
+        df = cache.load(data, read_data, refresh=refresh)
+        if columns is not None:
+            df = df[[c for c in df.columns if c in columns]]
+    else:
+        df = read_data(data, columns=columns)
+    if corrections is not None:
+        corrections.apply(df, columns)
+    return df
+
+
+def data_files(data):
+    """
+    Returns the files of a data setting: a file name, a glob pattern or a
+    comma or newline separated list of these
+
+    >>> data_files('2023.csv, 2024.csv')
+    ['2023.csv', '2024.csv']
+    """
+    files = []
+    for item in re.split(r'[,\n]', data):
+        item = item.strip()
+        if glob.has_magic(item):
+            files.extend(sorted(glob.glob(item)))
+        elif item:
+            files.append(item)
+    return files
+
+
+def has_snapshots(data):
+    """
+    Data given as a pattern or list of files is tagged by snapshot
+    """
+    return bool(re.search(r'[,\n]', data.strip())) or glob.has_magic(data)
+
+
+def snapshot_names(files):
+    """
+    Returns snapshot labels of files, the file names without extension if
+    these are distinct
+
+    >>> snapshot_names(['exports/2024-01.csv', 'exports/2024-02.csv'])
+    ['2024-01', '2024-02']
+    """
+    names = [os.path.splitext(os.path.basename(f))[0] for f in files]
+    if len(set(names)) < len(names):
+        return list(files)
+    return names
+
+
+def parse_data(data, cache=None, refresh=False, columns=None,
+               corrections=None):
+    """
+    Returns parsed data of a data setting, through the cache if given
+
+    Snapshot files are parsed in parallel, each through its own cache
+    entry, and concatenated with a snapshot column. Corrections with a
+    snapshot refer to rows of that file, others to rows of the concatenated
+    data.
+    """
+    if not has_snapshots(data):
+        return process_data(data, cache, refresh, columns, corrections)
+    files = data_files(data)
+    if not files:
+        raise FileNotFoundError(f'No data files: {data}')
+    with concurrent.futures.ThreadPoolExecutor(LOAD_WORKERS) as pool:
+        futures = [
+            pool.submit(
+                contextvars.copy_context().run,
+                process_data, f, cache, refresh, columns,
+            )
+            for f in files
+        ]
+        frames = [future.result() for future in futures]
+    df = combine(frames, snapshot_names(files))
+    if corrections is not None:
+        corrections.apply(df, columns)
+    return df
+
+
+def combine(frames, names):
+    """
+    Returns frames concatenated in one pass, tagged by a categorical
+    snapshot column of names
+    """
+    codes = np.repeat(np.arange(len(frames)), [len(f) for f in frames])
+    df = pd.concat(frames, ignore_index=True)
+    df[SNAPSHOT] = pd.Categorical.from_codes(codes, names)
+    return df
+
+
+def read_data(data, columns=None):
     h, e = os.path.splitext(data)
     if e == '.csv':
-        df = pd.read_csv(data)
+        df = pd.read_csv(data, usecols=usecols(columns))
     elif e == '.xlsx':
-        df = pd.read_excel(data)
+        df = pd.read_excel(data, usecols=usecols(columns))
     else:
         raise Exception(f'Unknown file format: {e}')
     return df
 
 
+def stream_csv(data, columns=None, chunksize=100_000, prepare=None,
+               filters=(), names=None, prepare_snapshot=None):
+    """
+    Returns csv data read in chunks
+
+    Each chunk is prepared (e.g. corrected) and filtered before the next
+    one is read, so memory use follows the size of the filtered data. data
+    may be a list of files, numbered in sequence and tagged by a snapshot
+    column of names if given. prepare_snapshot is called with each chunk,
+    still numbered within its file, and the snapshot name.
+    """
+    files = [data] if isinstance(data, str) else data
+    chunks = []
+    start = 0
+    for i, path in enumerate(files):
+        reader = pd.read_csv(
+            path, usecols=usecols(columns), chunksize=chunksize
+        )
+        offset = start
+        for chunk in reader:
+            if names is not None and prepare_snapshot is not None:
+                chunk = prepare_snapshot(chunk, names[i])
+            chunk.index += offset
+            start += len(chunk)
+            if prepare is not None:
+                chunk = prepare(chunk)
+            if names is not None:
+                chunk[SNAPSHOT] = pd.Categorical.from_codes(
+                    np.full(len(chunk), i), names
+                )
+            chunks.append(process_filters(chunk, filters))
+    if not chunks:
+        df = pd.read_csv(files[0], usecols=usecols(columns), nrows=0)
+        if names is not None:
+            df[SNAPSHOT] = pd.Categorical([], categories=names)
+        return df
+    return pd.concat(chunks)
+
+
+def usecols(columns):
+    """
+    Column selector for pandas readers, ignoring unknown columns
+    """
+    if columns is None:
+        return None
+    return lambda column: column in columns
+
+
+def needed_columns(specs):
+    """
+    Returns set of columns used by plot settings, None if all are needed
+
+    Rows printed with --show display all columns
+    """
+    columns = set()
+    for cfg in specs:
+        if cfg.get('show'):
+            return None
+        for key in ('cat', 'hue', 'facet'):
+            if cfg.get(key):
+                columns.add(cfg[key])
+        if cfg.get('num'):
+            num = cfg['num']
+            columns.update([num] if isinstance(num, str) else num)
+            if not isinstance(num, str):
+                columns.add(' '.join(num))
+        columns.update(cfg.get('annotate', ()))
+        columns.update(t.key for t in compile_filters(
+            tuple(cfg.get('filters', []))
+        ))
+    return columns
+
+
+def category_columns(specs):
+    """
+    Returns set of category, subcategory (hue) and facet columns of plot
+    settings
+    """
+    return {
+        cfg[key] for cfg in specs for key in ('cat', 'hue', 'facet')
+        if cfg.get(key)
+    }
+
+
+def categorize_columns(df, columns):
+    """
+    Convert columns to categoricals once, shared by all plots and tables
+    """
+    from .coordinates import categorize
+
+    with profile.stage('categorize', rows=len(df)):
+        for column in sorted(columns):
+            if column in df.columns:
+                df[column] = categorize(df[column])
+    return df
+
+
+def compact_data(df, cfg):
+    """
+    Returns df with smaller column types unless disabled in settings
+    """
+    from .util import compact, memory_report
+
+    if cfg.get('no_compact'):
+        return df
+    with profile.stage('compact', rows=len(df)):
+        compacted = compact(df)
+    if cfg.get('memory_report'):
+        print(memory_report(df, compacted).to_string(), file=sys.stderr)
+    return compacted
+
+
+def get_cache(cfg):
+    """
+    Returns parsed data cache from settings, None if disabled
+    """
+    from .cache import DataCache, DEFAULT_MAX_BYTES
+
+    if cfg.get('no_cache'):
+        return None
+    if cfg.get('cache_size'):
+        max_bytes = int(float(cfg['cache_size']) * 1024 ** 2)
+    else:
+        max_bytes = DEFAULT_MAX_BYTES
+    return DataCache(cfg.get('cache_dir'), max_bytes=max_bytes)
+
+
 def get_settings(ini='config.ini'):
     """
     cli overrides config overrides environment
@@ -54,6 +291,57 @@ def get_settings(ini='config.ini'):
     return settings
 
 
+def run_settings():
+    """
+    Returns settings of a run, a single numerical as a column name
+    """
+    cfg = get_settings()
+    if cfg.get('num'):
+        cfg['num'] = num_setting(cfg['num'])
+    return cfg
+
+
+def num_setting(num):
+    """
+    Returns a numerical setting as a column name, or a list of several
+
+    >>> num_setting(['Månadslön'])
+    'Månadslön'
+    """
+    if isinstance(num, list) and len(num) == 1:
+        return num[0]
+    return num
+
+
+def numericals(num, columns=()):
+    """
+    Returns the numerical columns of a setting
+
+    Several words naming a column when joined, e.g. an unquoted name with
+    spaces on the command line, are one column
+
+    >>> numericals(['Total', 'lön'], ['Total lön'])
+    ['Total lön']
+    >>> numericals(['Månadslön', 'Tillägg'], ['Månadslön', 'Tillägg'])
+    ['Månadslön', 'Tillägg']
+    """
+    if isinstance(num, str):
+        return [num]
+    joined = ' '.join(num)
+    if joined in columns:
+        return [joined]
+    return list(num)
+
+
+def resolve_numerical(cfg, columns):
+    """
+    Set the numerical of cfg to a column name or a list of several
+    """
+    metrics = numericals(cfg['num'], columns)
+    cfg['num'] = metrics[0] if len(metrics) == 1 else metrics
+    return metrics
+
+
 def get_environment():
     """
     Extract a defined set of environment variables
@@ -98,7 +386,11 @@ def get_args():
     import argparse
 
     parser = argparse.ArgumentParser()
-    parser.add_argument('--data', help='Data file (excel/csv)')
+    parser.add_argument(
+        '--data',
+        help='Data file (excel/csv), or snapshot files as a glob pattern or '
+        'comma separated list'
+    )
     parser.add_argument(
         '--boxplot-demo', action='store_true', help='Box demo'
     )
@@ -115,6 +407,9 @@ def get_args():
     parser.add_argument('--cat', help='Categorical label')
     parser.add_argument('--hue', help='Subcategorical label')
     parser.add_argument('--hue-order', help='Subcategorical label order')
+    parser.add_argument(
+        '--facet', help='Plot a panel per value of this column'
+    )
     parser.add_argument(
         '--annotate', nargs='+', default=(), help='pop-up info'
     )
@@ -122,6 +417,33 @@ def get_args():
     parser.add_argument('--show', nargs='+', default=[], help='filter data')
     parser.add_argument('--title', default=None, help='Pass title to fig')
     parser.add_argument('--table', type=int, default=None, help='Print table')
+    parser.add_argument(
+        '--percentiles', nargs='+', type=float,
+        help='Table percentiles (default 0.1 0.25 0.5 0.75 0.9)'
+    )
+    parser.add_argument(
+        '--box-renderer', choices=('seaborn', 'stats'),
+        help='Draw box plots with seaborn from rows, or from table statistics'
+    )
+    parser.add_argument(
+        '--max-points', type=int,
+        help='Thin point plots to about this many drawn points'
+    )
+    parser.add_argument(
+        '--table-only', action='store_true',
+        help='Only save the table, without plotting'
+    )
+    parser.add_argument(
+        '--approximate', action='store_true',
+        help='Table percentiles from mergeable quantile sketches'
+    )
+    parser.add_argument(
+        '--save-sketches', help='Save quantile sketches to a json file'
+    )
+    parser.add_argument(
+        '--merge-sketches', nargs='+', default=[],
+        help='Merge quantile sketches saved by earlier runs'
+    )
     parser.add_argument('--palette', default=None, help='Colors')
     parser.add_argument(
         '--yo', nargs='+', default=[], type=int, help='filter data'
@@ -129,126 +451,540 @@ def get_args():
     parser.add_argument('--ini', default='config.ini', help='Colors')
     parser.add_argument('--savefig', help='Save fig to named file')
     parser.add_argument(
-        '--display', action='store_true', help='Save fig to named file'
+        '--display', action='store_true',
+        help='Show the interactive plot window'
+    )
+    parser.add_argument(
+        '--serve', type=int, nargs='?', const=8050, metavar='PORT',
+        help='Serve plots and tables over http on localhost'
+    )
+    parser.add_argument('--host', help='Server address, default 127.0.0.1')
+    parser.add_argument(
+        '--serve-cache', type=int, help='Cached server results and frames'
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help='Re-render when data, korr.csv or config.ini change'
+    )
+    parser.add_argument(
+        '--watch-interval', type=float, help='Seconds between file checks'
+    )
+    parser.add_argument(
+        '--format', help='Figure file format, e.g. png, svg or pdf'
+    )
+    parser.add_argument('--dpi', type=float, help='Figure resolution')
+    parser.add_argument(
+        '--size', help='Figure width and height in inches, e.g. 16x9'
+    )
+    parser.add_argument(
+        '--batch', help='Render all plot specs of a json manifest'
+    )
+    parser.add_argument(
+        '--jobs', type=int, help='Number of processes for --batch'
+    )
+    parser.add_argument(
+        '--chunksize', type=int,
+        help='Stream csv data in chunks of this many rows'
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true', help='Always parse the data file'
+    )
+    parser.add_argument(
+        '--refresh-cache', action='store_true',
+        help='Parse the data file and update the cache'
+    )
+    parser.add_argument('--cache-dir', help='Parsed data cache directory')
+    parser.add_argument(
+        '--no-compact', action='store_true',
+        help='Keep the parsed column types'
+    )
+    parser.add_argument(
+        '--memory-report', action='store_true',
+        help='Print memory use per column before and after compaction'
     )
+    parser.add_argument(
+        '--cache-size', type=float, help='Parsed data cache limit (MB)'
+    )
+    parser.add_argument(
+        '--no-blit', action='store_true',
+        help='Redraw the full figure on hover'
+    )
+    parser.add_argument(
+        '--profile', nargs='?', const='text', choices=['text', 'json'],
+        help='Report time and rows per stage on stderr'
+    )
+    parser.add_argument(
+        '--profile-output', help='Write the --profile report to a file'
+    )
+    parser.add_argument('--cprofile', help='Dump cProfile statistics')
 
     args = parser.parse_args()
     return args
 
 
-def main():
+def get_palette(cfg):
     """
-    Main driver for annotated plots
+    Returns palette from settings, json string or dict
     """
-
-    # args = get_args()
-    # cfg = get_config(args, ini=args.ini)
-    cfg = get_settings()
-
-    if isinstance(cfg.get('num'), list):
-        cfg['num'] = ' '.join(cfg['num'])
-
-    if cfg.get('boxplot_demo'):
-        boxplot_demo()
-        return
-
-    if cfg.get('pointplot_demo'):
-        pointplot_demo()
-        return
-
-    if cfg.get('stripplot_demo'):
-        stripplot_demo()
-        return
-
-    if not cfg.get('data'):
-        raise Exception("No data")
-
-    if not cfg.get('num'):
-        raise Exception("No numerical")
-
     if cfg.get('palette'):
         if isinstance(cfg['palette'], str):
-            palette = json.loads(cfg['palette'])
-        else:
-            palette = cfg['palette']
-    else:
-        palette = None
-
-    df = process_data(cfg['data'])
+            return json.loads(cfg['palette'])
+        return cfg['palette']
+    return None
 
-    # Corrections known errors
-    if pathlib.Path('korr.csv').exists():
-        for correction in csv.DictReader(open('korr.csv')):
-            index = int(correction['index'])
-            column = correction['column']
-            value = correction['value']
-            df.loc[index, column] = value
 
-    df = process_filters(df, cfg.get('filters', []))
-
-    if 'hue_order' in cfg:
-        cfg['hue_order'] = cfg.get('hue_order').split(',')
-
-    plotter = plotters[cfg['plot_type']](
-        df,
-        cfg['num'],
-        categorical=cfg.get('cat'),
-        hue=cfg.get('hue'),
-        hue_order=cfg.get('hue_order'),
-        annotate=cfg.get('annotate', ()),
-        palette=palette,
-        cfg=cfg,
-    )
-
-    cfg['title'] = cfg.get('title', ' '.join(cfg.get('filters', [])))
+def load_data(cfg, specs=None):
+    """
+    Returns parsed data with known errors corrected
 
-    plotter.plot(
-        **cfg,
-    )
+    Only columns used by the plot specs (default cfg) are read. With a
+    chunksize csv data are streamed and filtered chunk by chunk with the
+    filters of cfg, which must be common to all specs.
+    """
+    from . import corrections
+
+    columns = needed_columns(specs or [cfg])
+    korr = corrections.load()
+
+    def prepare(df):
+        return apply_corrections(df, columns, korr)
+
+    def prepare_snapshot(df, name):
+        snapshot = korr.snapshot(name) if korr is not None else None
+        return df if snapshot is None else snapshot.apply(df, columns)
+
+    files = data_files(cfg['data'])
+    streamed = all(f.endswith('.csv') for f in files)
+    with profile.stage('load') as record:
+        if cfg.get('chunksize') and files and streamed:
+            df = stream_csv(
+                files,
+                columns=columns,
+                chunksize=int(cfg['chunksize']),
+                prepare=prepare,
+                filters=cfg.get('filters', []),
+                names=(
+                    snapshot_names(files)
+                    if has_snapshots(cfg['data']) else None
+                ),
+                prepare_snapshot=prepare_snapshot,
+            )
+        else:
+            df = parse_data(
+                cfg['data'],
+                cache=get_cache(cfg),
+                refresh=cfg.get('refresh_cache'),
+                columns=columns,
+                corrections=korr,
+            )
+        record['rows'] = len(df)
+    df = compact_data(df, cfg)
+    return categorize_columns(df, category_columns(specs or [cfg]))
+
+
+def apply_corrections(df, columns=None, korr=None):
+    """
+    Corrections of known errors in korr.csv, restricted to columns if given
+    """
+    if korr is None:
+        from . import corrections
+        korr = corrections.load()
+    if korr is not None:
+        korr.apply(df, columns)
+    return df
 
-    fig = plt.gcf()
-    plt.grid(True)
-    if cfg.get('display'):
-        plt.show()
 
+def output_files(cfg):
+    """
+    Returns names of figure and table files for a plot
+    """
     figure_file = f"{cfg['plot_type']}"
     csv_file = "tab"
 
-    figure_file += f"-{cfg['num']}"
-    csv_file += f"-{cfg['num']}"
+    num = cfg['num'] if isinstance(cfg['num'], str) else '+'.join(cfg['num'])
+    figure_file += f"-{num}"
+    csv_file += f"-{num}"
 
     if cfg.get('cat'):
         cats = re.sub('/', ':', f"-{cfg.get('cat', '')}")
         figure_file += cats
         csv_file += cats
 
+    # the table is not split by facet
+    if cfg.get('facet'):
+        figure_file += re.sub('/', ':', f"-per-{cfg['facet']}")
+
     values = [filter_values(f) for f in cfg.get('filters', [])]
     if values:
         figure_file += f"-{'_'.join(values)}"
         csv_file += f"-{'_'.join(values)}"
 
-    figure_file += ".png"
+    figure_file += f".{cfg.get('format') or 'png'}"
     csv_file += ".csv"
 
     if 'savefig' in cfg:
         figure_file = cfg['savefig']
 
-    fig.savefig(figure_file)
+    return figure_file, csv_file
+
+
+def figure_size(size):
+    """
+    Returns (width, height) in inches
+
+    >>> figure_size('16x9')
+    (16.0, 9.0)
+    """
+    if isinstance(size, str):
+        size = size.lower().replace('x', ' ').replace(',', ' ').split()
+    width, height = (float(s) for s in size)
+    return width, height
+
+
+def savefig_options(cfg):
+    """
+    Returns savefig keyword arguments from settings
+    """
+    options = {}
+    if cfg.get('format'):
+        options['format'] = cfg['format']
+    if cfg.get('dpi'):
+        options['dpi'] = float(cfg['dpi'])
+    return options
+
+
+def select_backend(cfg):
+    """
+    Non-interactive Agg backend unless the plot is displayed, or a backend
+    is chosen with MPLBACKEND
+    """
+    if cfg.get('display') or os.getenv('MPLBACKEND'):
+        return
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def compute_table(df, cfg, plotter=None):
+    """
+    Returns exact statistics table, or approximate from quantile sketches
+    merged with sketches of earlier runs
+
+    An exact table is shared with the plotter that drew the data
+    """
+    from . import stats
+    from .sketch import Sketches
+
+    if plotter is not None and not cfg.get('approximate'):
+        return plotter.table(numerical=cfg['num'])
+
+    if not cfg.get('approximate'):
+        return stats.table(
+            df,
+            cfg['num'],
+            categorical=cfg.get('cat'),
+            hue=cfg.get('hue'),
+            percentiles=cfg.get('percentiles'),
+        )
+
+    if not isinstance(cfg['num'], str):
+        if cfg.get('merge_sketches') or cfg.get('save_sketches'):
+            raise Exception('Sketch files hold a single numerical')
+        return pd.concat(
+            [compute_table(df, {**cfg, 'num': num}) for num in cfg['num']],
+            axis=1, keys=cfg['num'],
+        )
+
+    sketches = Sketches().update(
+        df, cfg['num'], cfg.get('cat'), cfg.get('hue')
+    )
+    for path in cfg.get('merge_sketches', []):
+        sketches.merge(Sketches.load(path))
+    if cfg.get('save_sketches'):
+        sketches.save(cfg['save_sketches'])
+    table = sketches.describe(cfg.get('percentiles'))
+    error = table.attrs['rank_error']
+    print(f"Approximate percentiles, rank error {error:.2%}")
+    return table
+
+
+def write_table(table, csv_file, cfg, writer=None):
+    """
+    Print table rounded to the requested precision and save as csv/xlsx
+
+    The files are written by writer if given, otherwise concurrently before
+    returning
+    """
+    from . import output
 
     if cfg.get('table'):
         precision = cfg.get('table')
-        table = plotter.table().round(precision)
+        table = table.round(precision)
     else:
-        table = plotter.table().fillna(0).round().astype(int)
+        table = table.fillna(0).round().astype(int)
     # print(tabulate(table, table.columns, tablefmt="rounded_grid"))
     print(table)
-    table.to_csv(csv_file)
-    table.to_excel(csv_file.strip('csv') + 'xlsx')
+    if writer is None:
+        with output.Writer() as writer:
+            return write_table(table, csv_file, cfg, writer)
+    writer.submit(output.write_csv, table, csv_file)
+    writer.submit(
+        output.write_excel, table, os.path.splitext(csv_file)[0] + '.xlsx'
+    )
+
+
+def render_table(df, cfg):
+    """
+    Filter data and save table files, without plotting
+    """
+    resolve_numerical(cfg, df.columns)
+    with profile.stage('filter') as record:
+        df = process_filters(df, cfg.get('filters', []))
+        record['rows'] = len(df)
+    _, csv_file = output_files(cfg)
+    with profile.stage('table', rows=len(df)):
+        table = compute_table(df, cfg)
+    write_table(table, csv_file, cfg)
+    return csv_file
+
+
+def panels(plot_type, n, ax=None, grid=False):
+    """
+    Returns axes of n panels of one figure, side by side for categories
+    along y and stacked for categories along x, sharing the category axis.
+    Point plots are ranked per panel and share no axis.
+
+    With grid the panels are laid out in rows of about sqrt(n) sharing both
+    axes, the numerical axis only for point plots. With ax the panels
+    replace it in its figure
+    """
+    from .plotters import plotters, BoxPlotter, HtripPlotter, PointPlotter
+
+    horizontal = issubclass(plotters[plot_type], (BoxPlotter, HtripPlotter))
+    point = issubclass(plotters[plot_type], PointPlotter)
+    width, height = (9, 16) if horizontal else (16, 9)
+    if grid:
+        columns = max(math.ceil(math.sqrt(n)), 1)
+        shape = (max(math.ceil(n / columns), 1), columns)
+        width, height = width / 2, height / 2
+        share = {'sharey': True} if point else {'sharex': True, 'sharey': True}
+    else:
+        shape = (1, n) if horizontal else (n, 1)
+        if point:
+            share = {}
+        else:
+            share = {'sharey': True} if horizontal else {'sharex': True}
+    if ax is None:
+        fig = plt.figure(figsize=(width * shape[1], height * shape[0]))
+    else:
+        fig = ax.figure
+        fig.delaxes(ax)
+    axes = list(fig.subplots(*shape, squeeze=False, **share).flat)
+    for unused in axes[n:]:
+        fig.delaxes(unused)
+    return axes[:n]
+
+
+def split_facets(df, column, order=None):
+    """
+    Returns values of a facet column, in order if given, and the rows of
+    each, split in one grouping pass
+
+    Values without rows are left out
+    """
+    from .coordinates import categorize
+
+    values = categorize(df[column], order)
+    codes = values.cat.codes.to_numpy()
+    positions = np.argsort(codes, kind='stable')
+    labels = list(values.cat.categories)
+    bounds = np.searchsorted(codes[positions], np.arange(len(labels) + 1))
+    return [
+        (label, df.iloc[positions[start:stop]])
+        for label, start, stop in zip(labels, bounds[:-1], bounds[1:])
+        if stop > start
+    ]
+
+
+def plot_facets(plotter, cfg, ax=None):
+    """
+    Plot a panel per value of the facet column, in a grid of one figure
+
+    The panels share the category and subcategory (hue) levels of plotter,
+    which is not drawn, each has its own plotter and hit index. Without
+    facet values left an empty plot is drawn. Returns the panel plotters
+    """
+    from .plotters import plotters
+
+    facet = cfg['facet']
+    order = filter_dict(cfg.get('filters', [])).get(facet)
+    if isinstance(order, str):
+        order = [order]
+    facets = split_facets(plotter.df, facet, order)
+    if not facets:
+        _, empty = plotter.subplots((16, 9), ax)
+        empty.set_title(cfg['title'])
+        return []
+    settings = {
+        **plotter.settings,
+        'order': plotter.categorical_values() or None,
+        'hue_order': plotter.hue_values() or None,
+    }
+    axes = panels(cfg['plot_type'], len(facets), ax, grid=True)
+    panel_plotters = []
+    for (value, rows), panel_ax in zip(facets, axes):
+        panel = plotters[cfg['plot_type']](rows, plotter.numerical, **settings)
+        panel.plot(**cfg, ax=panel_ax)
+        panel_ax.set_title(f'{facet}={value}')
+        panel_ax.grid(True)
+        panel_plotters.append(panel)
+    axes[0].figure.suptitle(cfg['title'])
+    return panel_plotters
+
+
+def render(df, cfg, ax=None):
+    """
+    Filter data, plot and save figure and table files
+
+    With ax the plot is drawn in place on an existing figure
+    """
+    from . import output
+    from .plotters import plotters
+
+    metrics = resolve_numerical(cfg, df.columns)
+    if cfg.get('facet') and len(metrics) > 1:
+        raise Exception('Facets of a single numerical only')
+    with profile.stage('filter') as record:
+        df = process_filters(df, cfg.get('filters', []))
+        record['rows'] = len(df)
+
+    if isinstance(cfg.get('hue_order'), str):
+        cfg['hue_order'] = cfg.get('hue_order').split(',')
+
+    with profile.stage('setup', rows=len(df)):
+        plotter = plotters[cfg['plot_type']](
+            df,
+            metrics[0],
+            categorical=cfg.get('cat'),
+            hue=cfg.get('hue'),
+            hue_order=cfg.get('hue_order'),
+            filters=cfg.get('filters', []),
+            annotate=cfg.get('annotate', ()),
+            palette=get_palette(cfg),
+            blit=not cfg.get('no_blit'),
+            interactive=bool(cfg.get('display')),
+            percentiles=cfg.get('percentiles'),
+            cfg=cfg,
+        )
+        # panels share the categorized frame of the first plotter
+        panel_plotters = [plotter] + [
+            plotters[cfg['plot_type']](
+                plotter.df, metric, **plotter.settings
+            )
+            for metric in metrics[1:]
+        ]
+
+    cfg['title'] = cfg.get('title', ' '.join(cfg.get('filters', [])))
+
+    with profile.stage('plot', rows=len(df)):
+        if cfg.get('facet'):
+            plot_facets(plotter, cfg, ax)
+        elif len(metrics) == 1:
+            plotter.plot(**cfg, ax=ax)
+        else:
+            axes = panels(cfg['plot_type'], len(metrics), ax)
+            for panel, metric, panel_ax in zip(panel_plotters, metrics, axes):
+                panel.plot(**{**cfg, 'num': metric, 'title': ''}, ax=panel_ax)
+                panel_ax.grid(True)
+            axes[0].figure.suptitle(cfg['title'])
+
+    fig = plt.gcf()
+    plt.grid(True)
+    if cfg.get('size'):
+        fig.set_size_inches(figure_size(cfg['size']))
+    if cfg.get('display') and ax is None:
+        plt.show()
+
+    figure_file, csv_file = output_files(cfg)
+
+    with output.Writer() as writer:
+        writer.submit(
+            output.write_figure, fig, figure_file, **savefig_options(cfg)
+        )
+        with profile.stage('table', rows=len(df)):
+            table = compute_table(plotter.df, cfg, plotter)
+        write_table(table, csv_file, cfg, writer)
 
     show = cfg.get('show', [])
     if show:
         print(process_filters(df, show).T.dropna())
 
+    return figure_file, csv_file
+
+
+def main():
+    """
+    Main driver for annotated plots
+    """
+
+    # args = get_args()
+    # cfg = get_config(args, ini=args.ini)
+    cfg = run_settings()
+
+    if cfg.get('boxplot_demo'):
+        from .demos import boxplot_demo
+        boxplot_demo()
+        return
+
+    if cfg.get('pointplot_demo'):
+        from .demos import pointplot_demo
+        pointplot_demo()
+        return
+
+    if cfg.get('stripplot_demo'):
+        from .demos import stripplot_demo
+        stripplot_demo()
+        return
+
+    if not cfg.get('data'):
+        raise Exception("No data")
+
+    with profile.session(
+        cfg.get('profile'), cfg.get('profile_output'), cfg.get('cprofile')
+    ):
+        run(cfg)
+
+
+def run(cfg):
+    """
+    Load data and render plot, table or batch of plots
+    """
+    if cfg.get('batch'):
+        from .batch import run_batch
+        run_batch(cfg, cfg['batch'], jobs=cfg.get('jobs'))
+        return
+
+    if cfg.get('serve'):
+        # requests give the numerical
+        from .server import serve
+        serve(cfg)
+        return
+
+    if not cfg.get('num'):
+        raise Exception("No numerical")
+
+    if cfg.get('watch'):
+        from .watch import watch
+        select_backend(cfg)
+        watch(cfg, settings=run_settings)
+        return
+
+    df = load_data(cfg)
+    if cfg.get('table_only'):
+        render_table(df, cfg)
+    else:
+        select_backend(cfg)
+        render(df, cfg)
+
 
 if __name__ == "__main__":
     main()
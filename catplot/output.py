@@ -0,0 +1,148 @@
+"""
+Concurrent, atomic writing of figure and table files
+
+Files are written to a temporary name in the target directory and renamed
+in place when complete, so an interrupted run never leaves a partial file.
+"""
+import concurrent.futures
+import contextlib
+import contextvars
+import math
+import os
+import pathlib
+import secrets
+
+import pandas as pd
+
+from . import profile
+
+MAX_WORKERS = 3
+STREAM_ROWS = 10_000
+
+
+@contextlib.contextmanager
+def atomic(path):
+    """
+    Yields a temporary path with the suffix of path, renamed to path on
+    success and removed on failure
+
+    Nothing is replaced if nothing was written to the temporary path
+    """
+    path = pathlib.Path(path)
+    tmp = path.with_name(f'.{path.stem}-{secrets.token_hex(4)}{path.suffix}')
+    try:
+        yield tmp
+        if tmp.exists():
+            os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def write_figure(fig, path, **kwargs):
+    """
+    Save fig to path, with the extension of the format if path has none
+
+    Returns the path written
+    """
+    path = pathlib.Path(path)
+    if not path.suffix:
+        from matplotlib import rcParams
+
+        kwargs['format'] = kwargs.get('format') or rcParams['savefig.format']
+        path = path.with_name(f"{path.name}.{kwargs['format']}")
+    with profile.stage('savefig'), atomic(path) as tmp:
+        fig.savefig(tmp, **kwargs)
+    return path
+
+
+def write_csv(table, path):
+    with profile.stage('write_csv', rows=len(table)), atomic(path) as tmp:
+        table.to_csv(tmp)
+
+
+def write_excel(table, path, stream_rows=STREAM_ROWS):
+    """
+    Write table as xlsx, streamed row by row for large tables
+    """
+    with profile.stage('write_excel', rows=len(table)), atomic(path) as tmp:
+        if len(table) > stream_rows:
+            stream_excel(table, tmp)
+        else:
+            table.to_excel(tmp)
+
+
+def stream_excel(table, path):
+    """
+    Write table with the write-only openpyxl workbook, in constant memory
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    names = list(table.index.names)
+    sheet.append(names + [
+        ' '.join(map(str, column)) if isinstance(column, tuple)
+        else str(column)
+        for column in table.columns
+    ])
+    for key, *values in table.itertuples(name=None):
+        keys = key if isinstance(table.index, pd.MultiIndex) else (key,)
+        sheet.append([_cell(k) for k in keys] + [_cell(v) for v in values])
+    workbook.save(path)
+
+
+def _cell(value):
+    """
+    Returns value as stored by openpyxl, None for missing numbers
+    """
+    if isinstance(value, tuple):
+        return str(value)
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class Writer:
+    """
+    Bounded thread pool of output jobs
+
+    Used as a context manager the jobs are waited for on exit and the first
+    failure is raised
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers)
+        self.futures = []
+
+    def submit(self, function, *args, **kwargs):
+        """
+        Run function in the pool, in a copy of the current context so that
+        profiling stages are recorded
+        """
+        context = contextvars.copy_context()
+        future = self.pool.submit(context.run, function, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def wait(self):
+        try:
+            for future in concurrent.futures.as_completed(self.futures):
+                future.result()
+        finally:
+            self.futures.clear()
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if exc[0] is None:
+                self.wait()
+        finally:
+            self.close()
@@ -1,8 +1,16 @@
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 
-from . import util
+from . import profile, stats, util
+from .coordinates import (
+    categorize, category_codes, coordinates, level_shift, sorted_labels,
+)
+from .hittest import HitIndex
+from .lazy import LazyModule
+from .tooltip import ANNOTATION_STYLE, Tooltip
+
+sns = LazyModule('seaborn')
+plt = LazyModule('matplotlib.pyplot')
 
 
 class Plotter:
@@ -15,6 +23,7 @@ class Plotter:
         plot(self, **kwargs)
         get_row(self, event)
         get_coordinate(self, row)
+        hit_points(self, frame)
     """
 
     def __init__(self, df, numerical, **kwargs):
@@ -27,11 +36,51 @@ class Plotter:
         self.hue = settings.get("hue")
         self.annotate = settings.get("annotate", numerical)
         self.annotations = []
+        self.tooltip = None
         self.fig = None
         self.ax = None
         self.sorted = None
         self.palette = settings.get("palette")
         self.settings = settings
+        self._hit_index = None
+        self._hit_key = None
+        self._tables = {}
+        self._levels = {}
+        self._coordinates = None
+        columns = {
+            column: categorize(df[column])
+            for column in (self.categorical, self.hue)
+            if column is not None and column in df.columns
+        }
+        if columns:
+            # shallow copy, the caller's frame is not modified
+            self.df = df.copy(deep=False)
+            for column, values in columns.items():
+                self.df[column] = values
+
+    def axis_coordinates(self, function):
+        """
+        Returns coordinates of the rows along the categorical axis, computed
+        on first use. Only hover needs them, saved plots skip the work.
+        """
+        if self._coordinates is None:
+            with profile.stage("coordinates", rows=len(self.df)):
+                self._coordinates = function()
+        return self._coordinates
+
+    def levels(self, column, order=None):
+        """
+        Returns the plotted values of a categorical column, in order if
+        given, otherwise in category order. Computed once per column.
+        """
+        if column not in self._levels:
+            if isinstance(order, str):
+                self._levels[column] = [order]
+            elif order:
+                self._levels[column] = list(order)
+            else:
+                self._levels[column] = sorted_labels(self.df[column])
+        return self._levels[column]
 
     def categorical_values(self):
         """
@@ -42,11 +91,8 @@ class Plotter:
 
         # preserve the order of filtered category values
         filters = util.filter_dict(self.settings['filters'])
-        if self.categorical in filters:
-            return filters[self.categorical]
-
-        self.df[self.categorical] = self.df[self.categorical].astype(str)
-        return sorted(list(self.df[self.categorical].dropna().unique()))
+        order = self.settings.get('order') or filters.get(self.categorical)
+        return self.levels(self.categorical, order)
 
     def hue_values(self):
         """
@@ -54,14 +100,23 @@ class Plotter:
         """
         if self.hue is None:
             return []
-        if 'hue_order' in self.settings:
-            return self.settings['hue_order']
-        return sorted(list(self.df[self.hue].dropna().unique()))
+        filters = util.filter_dict(self.settings['filters'])
+        order = self.settings.get('hue_order') or filters.get(self.hue)
+        return self.levels(self.hue, order)
 
     def plot(self, **kwargs):
         "To be implemented by subclass"
         raise NotImplementedError
 
+    def subplots(self, figsize, ax=None):
+        """
+        Returns a new figure and axes, or the figure of ax to draw in place
+        """
+        if ax is None:
+            return plt.subplots(figsize=figsize)
+        plt.sca(ax)
+        return ax.figure, ax
+
     def get_row(self, event):
         "To be implemented by subclass"
         raise NotImplementedError
@@ -70,23 +125,51 @@ class Plotter:
         "To be implemented by subclass"
         raise NotImplementedError
 
+    def hit_frame(self):
+        """
+        Returns the frame of plotted rows
+        """
+        return self.df
+
+    def hit_points(self, frame):
+        """
+        To be implemented by subclass
+
+        Returns primary and secondary coordinates of the plotted rows and
+        their hit tolerances
+        """
+        raise NotImplementedError
+
+    def hit_index(self):
+        """
+        Returns spatial index of plotted points, rebuilt when the data change
+        """
+        frame = self.hit_frame()
+        key = (id(frame), frame.shape)
+        if self._hit_index is None or self._hit_key != key:
+            self._hit_index = HitIndex(*self.hit_points(frame))
+            self._hit_key = key
+        return self._hit_index
+
+    def hit_row(self, primary, secondary):
+        """
+        Returns plotted row nearest to a point, None if nothing is near
+        """
+        position = self.hit_index().query(primary, secondary)
+        if position is not None:
+            return self.hit_frame().iloc[position]
+
     def __call__(self, event, row=None, xytext=(-50, 50)):
         """
         Generic method that allows interaction with mouse
         to display information about a data point
         """
-        if row is None:
+        if row is None and self.in_axes(event):
             row = self.get_row(event)
+        if self.tooltip is not None and event is not None:
+            return self.hover(row)
         if row is not None:
-            try:
-                info = "\n".join(
-                    f"{row[k]}"
-                    for k in self.annotate
-                    if pd.notnull(row[k]) and row[k] != 0
-                )
-            except KeyError:
-                print(self.df.columns)
-                raise SystemExit
+            info = self.info(row)
             fig = plt.gcf()
             ax = plt.gca()
             if self.annotate:
@@ -94,15 +177,7 @@ class Plotter:
                     info,
                     xy=self.get_coordinate(row),
                     xytext=xytext,
-                    textcoords="offset points",
-                    bbox={
-                        "boxstyle": "square",
-                        "fc": "w",
-                        "lw": 2,
-                        "pad": 0.6,
-                    },
-                    arrowprops={"arrowstyle": "->"},
-                    size="x-large",
+                    **ANNOTATION_STYLE
                 ))
             fig.canvas.draw_idle()
             return row
@@ -111,6 +186,50 @@ class Plotter:
                 a.remove()
             self.annotations.clear()
 
+    def in_axes(self, event):
+        """
+        Events in other panels of the figure are not for this plotter
+        """
+        return getattr(event, "inaxes", None) in (None, self.ax)
+
+    def info(self, row):
+        """
+        Returns annotation text for a row
+        """
+        try:
+            return "\n".join(
+                f"{row[k]}"
+                for k in self.annotate
+                if pd.notnull(row[k]) and row[k] != 0
+            )
+        except KeyError:
+            print(self.df.columns)
+            raise SystemExit
+
+    def hover(self, row):
+        """
+        Update the blitted tooltip for the row under the mouse
+        """
+        if row is None or not self.annotate:
+            self.tooltip.hide()
+        else:
+            self.tooltip.show(self.info(row), self.get_coordinate(row))
+        return row
+
+    def connect(self):
+        """
+        Connect mouse events of the current figure to the plotter
+
+        Nothing is connected for non-interactive (saved only) plots
+        """
+        if not self.settings.get("interactive", True):
+            return
+        canvas = self.fig.canvas
+        if self.settings.get("blit", True) and canvas.supports_blit:
+            self.tooltip = Tooltip(self.ax)
+        canvas.mpl_connect("button_press_event", self.on_click)
+        canvas.mpl_connect("motion_notify_event", self)
+
     def on_click(self, event):
         """
         Action when mouse is clicked
@@ -119,27 +238,45 @@ class Plotter:
         for a in self.annotations:
             a.remove()
         self.annotations.clear()
+        if self.tooltip is not None:
+            self.tooltip.hide()
         plt.gcf().canvas.draw_idle()
 
-    def table(self):
-        percentiles = (0.1, 0.25, 0.75, 0.9)
-        self.df["alla"] = "Alla"
-        all_stat = self.df.groupby("alla")[self.numerical].describe(
-            percentiles=percentiles
-        )
-        if self.categorical:
-            if self.hue:
-                groups = [self.categorical, self.hue]
-            else:
-                groups = self.categorical
-            grouped_stat = self.df.groupby(groups)[
-                self.numerical
-            ].describe(percentiles=percentiles)
-            stat = pd.concat([grouped_stat, all_stat])
-        else:
-            stat = all_stat
+    def table(self, percentiles=None, numerical=None):
+        """
+        Returns descriptive statistics of the numerical variable per category
+        and subcategory, with totals
 
-        return stat
+        A list of numerical variables gives one column group each, grouped
+        in the same pass. Tables are computed once per data and shared
+        between drawing and output: percentiles not computed before are
+        added to the cached table, other requests select its columns, so
+        drawn boxes and saved tables have the same numbers
+        """
+        percentiles = stats.parse_percentiles(
+            percentiles or self.settings.get("percentiles")
+        )
+        numerical = numerical or self.numerical
+        if not isinstance(numerical, str):
+            numerical = tuple(numerical)
+        key = (numerical, id(self.df), self.df.shape)
+        computed, table = self._tables.get(key, ((), None))
+        if not set(percentiles) <= set(computed):
+            computed = tuple(sorted(set(computed) | set(percentiles)))
+            table = stats.table(
+                self.df,
+                numerical if isinstance(numerical, str) else list(numerical),
+                categorical=self.categorical,
+                hue=self.hue,
+                percentiles=computed,
+            )
+            self._tables[key] = computed, table
+        if computed == percentiles:
+            return table
+        labels = stats.columns(percentiles)
+        if isinstance(numerical, str):
+            return table[labels]
+        return table[[(name, label) for name in numerical for label in labels]]
 
 
 class BoxPlotter(Plotter):
@@ -153,17 +290,13 @@ class BoxPlotter(Plotter):
         """
         super().__init__(df, numerical, **kwargs)
         self.hue = kwargs.get("hue")
-        self.df["y"] = self.set_y()
 
-    def hue_values(self):
+    @property
+    def y(self):
         """
-        Returns list of values associated with the subcategory (hue)
+        Expected y coordinates of the rows
         """
-        if self.hue is None:
-            return []
-        if 'hue_order' in self.settings:
-            return self.settings['hue_order']
-        return sorted(list(self.df[self.hue].dropna().unique()))
+        return self.axis_coordinates(self.set_y)
 
     def plot(self, **kwargs):
         """
@@ -171,7 +304,7 @@ class BoxPlotter(Plotter):
         with mouse
         """
         #self.fig, self.ax = plt.subplots(figsize=(16, 9))
-        self.fig, self.ax = plt.subplots(figsize=(9, 16))
+        self.fig, self.ax = self.subplots((9, 16), kwargs.get("ax"))
 
         filters = util.filter_dict(kwargs.get('filters', []))
 
@@ -185,19 +318,26 @@ class BoxPlotter(Plotter):
         else:
             hue_order = self.hue_values() or None
 
-        sns.boxplot(
-            data=self.df,
-            x=self.numerical,
-            y=self.categorical,
-            hue=self.hue,
-            whis=(10, 90),
-            order=category_order,
-            hue_order=hue_order,
-            orient="h",
-            showmeans=True,
-            meanline=True,
-            meanprops={'color': 'white'},
+        renderer = kwargs.get("box_renderer") or self.settings.get(
+            "box_renderer"
         )
+        with profile.stage("draw", rows=len(self.df)):
+            if renderer == "stats":
+                self.draw_boxes(category_order, hue_order)
+            else:
+                sns.boxplot(
+                    data=self.df,
+                    x=self.numerical,
+                    y=self.categorical,
+                    hue=self.hue,
+                    whis=(10, 90),
+                    order=category_order,
+                    hue_order=hue_order,
+                    orient="h",
+                    showmeans=True,
+                    meanline=True,
+                    meanprops={'color': 'white'},
+                )
 
         if kwargs.get("show") is not None:
             show_rows = util.process_filters(self.df, kwargs["show"])
@@ -210,11 +350,127 @@ class BoxPlotter(Plotter):
                 xy = (-50, 50 * (0.5 + 0.5 * i))
                 self(None, row, xy)
 
-        self.fig.canvas.mpl_connect("button_press_event", self.on_click)
-        self.fig.canvas.mpl_connect("motion_notify_event", self)
+        self.connect()
 
         self.ax.set_title(kwargs.get("title"))
 
+    def draw_boxes(self, category_order, hue_order):
+        """
+        Draw boxes with matplotlib bxp from the statistics table, with
+        whiskers at 10/90% and only the points outside them
+        """
+        from matplotlib.patches import Patch
+
+        percentiles = tuple(sorted(
+            set(stats.parse_percentiles(self.settings.get("percentiles")))
+            | set(stats.DEFAULT_PERCENTILES)
+        ))
+        rows = {
+            str_key(key): row
+            for key, row in self.table(percentiles).to_dict("index").items()
+        }
+
+        if isinstance(category_order, str):
+            category_order = [category_order]
+        categories = list(category_order or [stats.TOTAL])
+        hues = list(hue_order or [None])
+        width = 0.8 / len(hues)
+        cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+        palette = self.palette if isinstance(self.palette, dict) else {}
+        colors = [
+            palette.get(hue, cycle[j % len(cycle)])
+            for j, hue in enumerate(hues)
+        ]
+
+        keys = [
+            self.box_key(category, hue)
+            for category in categories for hue in hues
+        ]
+        low = np.array([rows.get(k, {}).get("10%", np.nan) for k in keys])
+        high = np.array([rows.get(k, {}).get("90%", np.nan) for k in keys])
+        fliers = self.outliers(categories, hues, low, high)
+
+        boxes, positions, facecolors = [], [], []
+        for slot, key in enumerate(keys):
+            row = rows.get(key)
+            if row is None or not row["count"]:
+                continue
+            i, j = divmod(slot, len(hues))
+            boxes.append(dict(
+                med=row["50%"], q1=row["25%"], q3=row["75%"],
+                whislo=row["10%"], whishi=row["90%"], mean=row["mean"],
+                fliers=fliers[slot],
+            ))
+            positions.append(i + (j - (len(hues) - 1) / 2) * width)
+            facecolors.append(colors[j])
+
+        artists = bxp(
+            self.ax, boxes, positions=positions, widths=width,
+            showmeans=True, meanline=True, meanprops={"color": "white"},
+            medianprops={"color": "0.25"}, patch_artist=True,
+            manage_ticks=False,
+        )
+        for patch, color in zip(artists["boxes"], facecolors):
+            patch.set_facecolor(color)
+
+        self.ax.set_yticks(range(len(categories)))
+        self.ax.set_yticklabels(categories if self.categorical else [])
+        self.ax.set_ylim(len(categories) - 0.5, -0.5)
+        self.ax.set_xlabel(self.numerical)
+        self.ax.set_ylabel(self.categorical or "")
+        if self.hue is not None:
+            self.ax.legend(
+                handles=[
+                    Patch(facecolor=color, label=hue)
+                    for hue, color in zip(hues, colors)
+                ],
+                title=self.hue,
+            )
+
+    def box_key(self, category, hue):
+        """
+        Returns statistics table row of a box, with values as strings
+        """
+        if self.categorical is None:
+            return stats.TOTAL
+        if self.hue is None:
+            return str(category)
+        return (str(category), str(hue))
+
+    def outliers(self, categories, hues, low, high):
+        """
+        Returns values outside the whiskers for each box slot
+        category * len(hues) + hue
+        """
+        values = self.df[self.numerical].to_numpy(dtype=float)
+        if self.categorical is None:
+            slots = np.zeros(len(values), dtype=np.int64)
+        else:
+            slots = category_codes(
+                self.df[self.categorical], [str(c) for c in categories]
+            )
+        if self.hue is not None:
+            hue_codes = category_codes(
+                self.df[self.hue], [str(h) for h in hues]
+            )
+            slots = np.where(
+                (slots < 0) | (hue_codes < 0), -1,
+                slots * len(hues) + hue_codes,
+            )
+
+        valid = np.flatnonzero(slots >= 0)
+        outside = (
+            (values[valid] < low[slots[valid]])
+            | (values[valid] > high[slots[valid]])
+        )
+        index = valid[outside]
+        index = index[np.argsort(slots[index], kind="stable")]
+        bounds = np.searchsorted(slots[index], np.arange(len(low) + 1))
+        return [
+            values[index[start:stop]]
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+
     def get_row(self, event):
         """
         Given the coordinates of the mouse the function returns a row in the
@@ -222,67 +478,49 @@ class BoxPlotter(Plotter):
         """
         row = None
         if event.xdata is not None and event.ydata is not None:
-            in_x = (
-                self.df[self.numerical].max() - self.df[self.numerical].min()
-            ) * 0.01
-            in_y = (self.df.y.max() - self.df.y.min() + 1) * 0.01
-            is_near_x = (
-                self.df[self.numerical] - event.xdata
-            ) ** 2 < in_x ** 2
-            is_near_y = (self.df.y - event.ydata) ** 2 < in_y ** 2
-            selected = is_near_x & is_near_y
-            if selected.any():
-                row = self.df[selected].iloc[0]
+            row = self.hit_row(event.xdata, event.ydata)
         return row
 
+    def hit_points(self, frame):
+        """
+        Numerical values along x, category slots along y
+        """
+        x = frame[self.numerical]
+        y = self.y.loc[frame.index]
+        in_x = (x.max() - x.min()) * 0.01
+        in_y = (y.max() - y.min() + 1) * 0.01
+        return x, y, in_x, in_y
+
     def set_y(self):
         """
         set expected y coordinate of categorical data point
         """
         if self.categorical is None:
-            return pd.Series(len(self.df) * [0.0], index=self.df.index)
-        # y_labels = sorted(list(self.df[self.categorical].unique()))
-        y_labels = self.categorical_values()
-
-        y_values = pd.Series(
-            (
-                y_labels.index(row[self.categorical])
-                if pd.notnull(row[self.categorical])
-                else -1
-                for _, row in self.df.iterrows()
-            ),
-            index=self.df.index,
+            return coordinates(self.df, None)
+        return coordinates(
+            self.df,
+            self.categorical,
+            self.categorical_values(),
+            hue=self.hue,
+            hue_labels=self.hue_values() or None,
         )
-        if self.hue:
-            y_values += self.y_shift()
-        return y_values
 
     def y_shift(self):
         """
-        update expected y coordinate for subcategorical data point
+        update expected y coordinate for subcategorical data point, in the
+        hue order of the plot
         """
         if self.hue:
-            y_sublabels = sorted(list(self.df[self.hue].unique()))
-            y_subvalues = pd.Series(
-                (
-                    y_sublabels.index(row[self.hue])
-                    for _, row in self.df.iterrows()
-                ),
-                index=self.df.index,
-            )
-            multiplicity = len(y_sublabels)
-            level = (multiplicity - 1) / 2
-            level_shift = (y_subvalues - level) * 0.8 / multiplicity
+            shift = level_shift(self.df[self.hue], self.hue_values())
         else:
-            level_shift = pd.Series(len(self.df) * [0.0], index=self.df.index)
-
-        return level_shift
+            shift = len(self.df) * [0.0]
+        return pd.Series(shift, index=self.df.index)
 
     def get_coordinate(self, row):
         """
         Return coordinates of data point associated with a dataframe row
         """
-        return (row[self.numerical], row.y)
+        return (row[self.numerical], self.y.loc[row.name])
 
 
 class PointPlotter(Plotter):
@@ -299,16 +537,24 @@ class PointPlotter(Plotter):
             drop=True
         )
 
-        self.fig, self.ax = plt.subplots(figsize=(16, 9))
-        sns.stripplot(
-            data=self.sorted,
-            x=self.sorted.index,
-            y=self.numerical,
-            hue=self.categorical,
-            palette=self.palette,
-            ax=self.ax,
-            size=10,
-        ).set_xticklabels("")
+        self.fig, self.ax = self.subplots((16, 9), kwargs.get("ax"))
+        max_points = kwargs.get("max_points") or self.settings.get(
+            "max_points"
+        )
+        with profile.stage("draw", rows=len(self.sorted)):
+            if max_points and len(self.sorted) > int(max_points):
+                self.draw_thinned(int(max_points), kwargs.get("show") or [])
+            else:
+                sns.stripplot(
+                    data=self.sorted,
+                    x=self.sorted.index,
+                    y=self.numerical,
+                    hue=self.categorical,
+                    hue_order=self.categorical_values() or None,
+                    palette=self.palette,
+                    ax=self.ax,
+                    size=10,
+                ).set_xticklabels("")
         self.ax.legend(loc="upper left")
         self.ax.set_title(kwargs.get("title"))
 
@@ -319,8 +565,80 @@ class PointPlotter(Plotter):
             for ind, row in show_rows.iterrows():
                 self(None, row)
 
-        self.fig.canvas.mpl_connect("button_press_event", self.on_click)
-        self.fig.canvas.mpl_connect("motion_notify_event", self)
+        self.connect()
+
+    def draw_thinned(self, max_points, show=()):
+        """
+        Draw at most about max_points of the sorted curve, more detail is
+        drawn when zooming in on an x-range
+        """
+        values = self.sorted[self.numerical].to_numpy(dtype=float)
+        if self.categorical is None:
+            labels = []
+            self.codes = np.zeros(len(values), dtype=np.int64)
+        else:
+            column = self.sorted[self.categorical]
+            labels = self.categorical_values()
+            self.codes = category_codes(column, labels)
+            self.codes[self.codes < 0] = len(labels)
+        self.max_points = max_points
+        self.keep = np.flatnonzero(util.filter_mask(self.sorted, show))
+        if not show:
+            self.keep = self.keep[:0]
+
+        cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+        palette = self.palette if isinstance(self.palette, dict) else {}
+        self.layers = []
+        for code, label in enumerate(labels or [None]):
+            self.layers.append(self.ax.scatter(
+                [], [], s=100, label=label,
+                color=palette.get(label, cycle[code % len(cycle)]),
+            ))
+        self.ax.set_xlim(-0.5, len(values) - 0.5)
+        self.ax.set_ylim(*margins(values))
+        self.update_detail()
+        self.ax.callbacks.connect("xlim_changed", self.update_detail)
+
+    def thin(self, start, stop):
+        """
+        Returns sorted positions to draw between start and stop
+
+        The range is split in buckets and within each bucket the first and
+        last point of each category are kept. Values are sorted so these are
+        the bucket extremes and the shape of the curve is preserved. The end
+        points and --show rows are always kept.
+        """
+        if stop - start <= self.max_points:
+            return np.arange(start, stop)
+        ncodes = int(self.codes.max()) + 1 if len(self.codes) else 1
+        buckets = max(self.max_points // (2 * ncodes), 1)
+        step = max(-(-(stop - start) // buckets), 1)
+        positions = np.arange(start, stop)
+        key = (positions - start) // step * ncodes + self.codes[start:stop]
+        _, first = np.unique(key, return_index=True)
+        _, last = np.unique(key[::-1], return_index=True)
+        extremes = [start, stop - 1] if stop > start else []
+        return np.unique(np.concatenate([
+            positions[first],
+            positions[::-1][last],
+            self.keep,
+            extremes,
+        ]).astype(np.int64))
+
+    def update_detail(self, ax=None):
+        """
+        Redraw the points of the visible x-range
+        """
+        values = self.sorted[self.numerical].to_numpy(dtype=float)
+        xmin, xmax = sorted(self.ax.get_xlim())
+        start = min(max(int(np.floor(xmin)), 0), len(values))
+        stop = min(max(int(np.ceil(xmax)) + 1, start), len(values))
+        positions = self.thin(start, stop)
+        for code, layer in enumerate(self.layers):
+            shown = positions[self.codes[positions] == code]
+            layer.set_offsets(np.column_stack([shown, values[shown]]))
+        if ax is not None:
+            self.fig.canvas.draw_idle()
 
     def get_coordinate(self, row):
         """
@@ -334,15 +652,22 @@ class PointPlotter(Plotter):
         dataframe matching the data point
         """
         row = None
-        if event.xdata:
-            nearest_x = int(round(event.xdata))
-            if nearest_x in self.sorted.index:
-                nearest_y = self.sorted.loc[nearest_x, self.numerical]
-                diff_y = abs(event.ydata - nearest_y)
-                if diff_y < 1000:
-                    row = self.sorted.loc[nearest_x]
+        if event.xdata is not None and event.ydata is not None:
+            row = self.hit_row(event.xdata, event.ydata)
         return row
 
+    def hit_frame(self):
+        """
+        Points are plotted in sorted order
+        """
+        return self.sorted
+
+    def hit_points(self, frame):
+        """
+        Rank along x, numerical values along y
+        """
+        return range(len(frame)), frame[self.numerical], 0.5, 1000
+
 
 class StripPlotter(Plotter):
 
@@ -352,64 +677,61 @@ class StripPlotter(Plotter):
         """
         super().__init__(df, numerical, **kwargs)
         self.hue = kwargs.get("hue")
-        self.df["x"] = self.set_x()
+
+    @property
+    def x(self):
+        """
+        Expected x coordinates of the rows
+        """
+        return self.axis_coordinates(self.set_x)
 
     def set_x(self):
         """
         set expected x coordinate of categorical data point
         """
-        if self.categorical is None:
-            return pd.Series(len(self.df) * [0.0], index=self.df.index)
-        x_labels = sorted(list(self.df[self.categorical].unique()))
-        x_values = pd.Series(
-            (
-                x_labels.index(row[self.categorical])
-                if pd.notnull(row[self.categorical])
-                else -1
-                for _, row in self.df.iterrows()
-            ),
-            index=self.df.index,
+        return coordinates(
+            self.df, self.categorical, self.categorical_values() or None
         )
 
-        return x_values
-
     def plot(self, **kwargs):
         """
         Calls Seaborn strip function and connects the plot for interaction with
         mouse
         """
-        self.fig, self.ax = plt.subplots(figsize=(16, 9))
-        sns.stripplot(
-            data=self.df,
-            x=self.categorical,
-            y=self.numerical,
-            hue=self.hue,
-            order=self.categorical_values(),
-            hue_order=self.hue_values(),
-            orient='v',
-            jitter=0,
-        )
+        self.fig, self.ax = self.subplots((16, 9), kwargs.get("ax"))
+        with profile.stage("draw", rows=len(self.df)):
+            sns.stripplot(
+                data=self.df,
+                x=self.categorical,
+                y=self.numerical,
+                hue=self.hue,
+                order=self.categorical_values(),
+                hue_order=self.hue_values(),
+                orient='v',
+                jitter=0,
+            )
 
-        self.fig.canvas.mpl_connect("button_press_event", self.on_click)
-        self.fig.canvas.mpl_connect("motion_notify_event", self)
+        self.connect()
 
     def get_row(self, event):
         row = None
         if event.xdata is not None and event.ydata is not None:
-            in_y = (
-                self.df[self.numerical].max() - self.df[self.numerical].min()
-                ) * 0.01
-            in_x = (self.df.x.max() - self.df.x.min() + 1) * 0.01
-            is_near_y = (self.df[self.numerical] - event.ydata)**2 < in_y**2
-            is_near_x = (self.df.x - event.xdata)**2 < in_x**2
-            selected = is_near_x & is_near_y
-            if selected.any():
-                row = self.df[selected].iloc[0]
+            row = self.hit_row(event.ydata, event.xdata)
         return row
 
+    def hit_points(self, frame):
+        """
+        Numerical values along y, category slots along x
+        """
+        y = frame[self.numerical]
+        x = self.x.loc[frame.index]
+        in_y = (y.max() - y.min()) * 0.01
+        in_x = (x.max() - x.min() + 1) * 0.01
+        return y, x, in_y, in_x
+
     def get_coordinate(self, row):
         "Get stripplot coordinates"
-        return (row.x, row[self.numerical])
+        return (self.x.loc[row.name], row[self.numerical])
 
 
 class HtripPlotter(Plotter):
@@ -420,61 +742,85 @@ class HtripPlotter(Plotter):
         """
         super().__init__(df, numerical, **kwargs)
         self.hue = kwargs.get("hue")
-        self.df["y"] = self.set_y()
+
+    @property
+    def y(self):
+        """
+        Expected y coordinates of the rows
+        """
+        return self.axis_coordinates(self.set_y)
 
     def set_y(self):
         """
         set expected y coordinate of categorical data point
         """
-
-        if self.categorical is None:
-            return pd.Series(len(self.df) * [0.0], index=self.df.index)
-        y_labels = sorted(list(self.df[self.categorical].unique()))
-        y_values = pd.Series(
-            (
-                y_labels.index(row[self.categorical])
-                if pd.notnull(row[self.categorical])
-                else -1
-                for _, row in self.df.iterrows()
-            ),
-            index=self.df.index,
+        return coordinates(
+            self.df, self.categorical, self.categorical_values() or None
         )
 
-        return y_values
-
     def plot(self, **kwargs):
         """
         Calls Seaborn strip function and connects the plot for interaction with
         mouse
         """
-        self.fig, self.ax = plt.subplots(figsize=(16, 9))
-        sns.stripplot(
-            data=self.df,
-            x=self.numerical,
-            y=self.categorical,
-            hue=self.hue,
-            order=self.categorical_values(),
-            hue_order=self.hue_values(),
-            orient='h',
-            jitter=0,
-        )
+        self.fig, self.ax = self.subplots((16, 9), kwargs.get("ax"))
+        with profile.stage("draw", rows=len(self.df)):
+            sns.stripplot(
+                data=self.df,
+                x=self.numerical,
+                y=self.categorical,
+                hue=self.hue,
+                order=self.categorical_values(),
+                hue_order=self.hue_values(),
+                orient='h',
+                jitter=0,
+            )
 
-        self.fig.canvas.mpl_connect("button_press_event", self.on_click)
-        self.fig.canvas.mpl_connect("motion_notify_event", self)
+        self.connect()
 
     def get_row(self, event):
         row = None
         if event.xdata is not None and event.ydata is not None:
-            in_x = (
-                self.df[self.numerical].max() - self.df[self.numerical].min()
-                ) * 0.01
-            in_y = (self.df.y.max() - self.df.y.min() + 1) * 0.01
-            is_near_x = (self.df[self.numerical] - event.xdata)**2 < in_x**2
-            is_near_y = (self.df.y - event.ydata)**2 < in_y**2
-            selected = is_near_x & is_near_y
-            if selected.any():
-                row = self.df[selected].iloc[0]
+            row = self.hit_row(event.xdata, event.ydata)
         return row
 
+    def hit_points(self, frame):
+        """
+        Numerical values along x, category slots along y
+        """
+        x = frame[self.numerical]
+        y = self.y.loc[frame.index]
+        in_x = (x.max() - x.min()) * 0.01
+        in_y = (y.max() - y.min() + 1) * 0.01
+        return x, y, in_x, in_y
+
+
+def margins(values, fraction=0.05):
+    """
+    Returns axis limits of values with margins
+    """
+    low, high = np.nanmin(values), np.nanmax(values)
+    pad = (high - low) * fraction or 1
+    return low - pad, high + pad
+
+
+def str_key(key):
+    """
+    Table row key with values as strings
+    """
+    if isinstance(key, tuple):
+        return tuple(str(k) for k in key)
+    return str(key)
+
+
+def bxp(ax, boxes, **kwargs):
+    """
+    Horizontal Axes.bxp, orientation replaced vert in matplotlib 3.10
+    """
+    try:
+        return ax.bxp(boxes, orientation="horizontal", **kwargs)
+    except TypeError:
+        return ax.bxp(boxes, vert=False, **kwargs)
+
 
 plotters = {"box": BoxPlotter, "point": PointPlotter, "strip": StripPlotter}
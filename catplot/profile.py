@@ -0,0 +1,141 @@
+"""
+Per-stage timing of a run
+
+Code marks its stages
+
+    with profile.stage('filter') as record:
+        df = process_filters(df, filters)
+        record['rows'] = len(df)
+
+Stages are recorded while a Profile is collecting, or when listeners are
+registered, e.g. by a job runner
+
+    profile.add_listener(metrics.append)
+
+Otherwise a stage costs a context variable lookup. Nested stages are named
+by their path, e.g. plot/draw.
+"""
+import contextlib
+import contextvars
+import cProfile
+import json
+import sys
+import time
+
+_active = contextvars.ContextVar('profile', default=None)
+_path = contextvars.ContextVar('stage', default=())
+listeners = []
+
+
+def add_listener(listener):
+    """
+    Call listener with the record of every finished stage
+    """
+    listeners.append(listener)
+
+
+def remove_listener(listener):
+    listeners.remove(listener)
+
+
+class Profile:
+    """
+    Records of finished stages: wall and CPU seconds and rows
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def summary(self):
+        """
+        Returns a table of stages, indented by nesting
+        """
+        lines = [f"{'stage':<28} {'wall (s)':>9} {'cpu (s)':>9} {'rows':>10}"]
+        for record in sorted(self.records, key=lambda r: r['start']):
+            depth = record['stage'].count('/')
+            name = '  ' * depth + record['stage'].rsplit('/', 1)[-1]
+            rows = '' if record['rows'] is None else record['rows']
+            lines.append(
+                f"{name:<28} {record['wall']:>9.4f} {record['cpu']:>9.4f}"
+                f" {rows:>10}"
+            )
+        return '\n'.join(lines)
+
+    def to_json(self):
+        return json.dumps(
+            sorted(self.records, key=lambda r: r['start']), indent=2
+        )
+
+    def report(self, fmt='text', file=None):
+        """
+        Write the summary or json records to file, default stderr
+        """
+        text = self.to_json() if fmt == 'json' else self.summary()
+        if file is None:
+            print(text, file=sys.stderr)
+        else:
+            with open(file, 'w') as f:
+                print(text, file=f)
+
+
+@contextlib.contextmanager
+def stage(name, rows=None):
+    """
+    Time a stage, yields its record where rows may be updated
+    """
+    profile = _active.get()
+    if profile is None and not listeners:
+        yield {}
+        return
+    path = _path.get() + (name,)
+    token = _path.set(path)
+    record = dict(stage='/'.join(path), rows=rows, start=time.time())
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield record
+    finally:
+        record['wall'] = time.perf_counter() - wall
+        record['cpu'] = time.process_time() - cpu
+        _path.reset(token)
+        if profile is not None:
+            profile.records.append(record)
+        for listener in listeners:
+            listener(record)
+
+
+@contextlib.contextmanager
+def collect():
+    """
+    Collect stages run in the context, yields the Profile
+    """
+    profile = Profile()
+    token = _active.set(profile)
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
+
+
+@contextlib.contextmanager
+def session(fmt=None, output=None, cprofile=None):
+    """
+    Profile a run as requested on the command line
+
+    The stage report is written in fmt (text or json) when given, and
+    cProfile statistics are dumped to the cprofile file when given
+    """
+    if not fmt and not cprofile:
+        yield None
+        return
+    profiler = cProfile.Profile() if cprofile else None
+    with collect() as profile:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield profile
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(cprofile)
+            if fmt:
+                profile.report(fmt, output)
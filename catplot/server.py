@@ -0,0 +1,304 @@
+"""
+Local HTTP server of plots and tables, data loaded once
+
+    $ catplot --data export.xlsx --serve 8050
+
+    GET /plot?num=Månadslön&cat=Skola&hue=Kön&filters=Benämning=LEKTOR
+    GET /plot?...&format=svg
+    GET /table?num=Månadslön&cat=Skola&format=json
+
+Query parameters are plot and table settings of the command line, filters
+may be repeated. Settings naming files are not accepted. Rendered results
+and filtered frames are kept in LRU caches.
+"""
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import json
+import threading
+import urllib.parse
+
+from . import util
+from .lazy import LazyModule
+
+plt = LazyModule('matplotlib.pyplot')
+
+DEFAULT_ENTRIES = 64
+LIST_PARAMETERS = ('filters', 'annotate', 'percentiles', 'hue_order')
+# settings a request may give, never file names
+REQUEST_PARAMETERS = frozenset(LIST_PARAMETERS + (
+    'num', 'cat', 'hue', 'plot_type', 'format', 'dpi', 'size',
+    'approximate', 'title',
+))
+PLOT_TYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'pdf': 'application/pdf',
+}
+TABLE_TYPES = {'csv': 'text/csv', 'json': 'application/json'}
+
+
+class BadRequest(Exception):
+    pass
+
+
+class LRUCache:
+    """
+    Thread-safe mapping of at most maxsize least recently used items
+    """
+
+    def __init__(self, maxsize=DEFAULT_ENTRIES):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.items:
+                return default
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def parse_spec(query):
+    """
+    Returns plot settings of a query string
+
+    >>> parse_spec('num=kr&filters=km=F&filters=kr>0')
+    {'num': 'kr', 'filters': ['km=F', 'kr>0']}
+    """
+    spec = {}
+    for key, value in urllib.parse.parse_qsl(query):
+        key = key.replace('-', '_')
+        if key in LIST_PARAMETERS:
+            spec.setdefault(key, []).append(value)
+        else:
+            spec[key] = value
+    return spec
+
+
+def spec_key(spec):
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in spec.items()
+    ))
+
+
+class App:
+    """
+    Resident data, caches and rendering of plot and table requests
+    """
+
+    def __init__(self, df, cfg=None, entries=DEFAULT_ENTRIES):
+        self.df = df
+        self.cfg = cfg or {}
+        self.results = LRUCache(entries)
+        self.frames = LRUCache(entries)
+        self.render_lock = threading.Lock()
+
+    def settings(self, spec):
+        """
+        Returns settings of a request, spec overriding common settings
+        """
+        from .main import resolve_numerical
+
+        unknown = sorted(set(spec) - REQUEST_PARAMETERS)
+        if unknown:
+            raise BadRequest(f"Unknown parameters {', '.join(unknown)}")
+        cfg = {
+            k: v for k, v in self.cfg.items()
+            if k not in ('serve', 'display', 'host', 'watch', 'save_sketches')
+        }
+        cfg.update(spec)
+        if 'approximate' in spec:
+            cfg['approximate'] = spec['approximate'].lower() in (
+                '1', 'true', 'yes'
+            )
+        cfg['filters'] = self.cfg.get('filters', []) + spec.get('filters', [])
+        cfg.setdefault('plot_type', 'box')
+        if not cfg.get('num'):
+            raise BadRequest('num is required')
+        resolve_numerical(cfg, self.df.columns)
+        for key in ('num', 'cat', 'hue'):
+            columns = cfg.get(key) or []
+            if isinstance(columns, str):
+                columns = [columns]
+            for column in columns:
+                if column not in self.df.columns:
+                    raise BadRequest(f'Unknown column {column}')
+        return cfg
+
+    def filtered(self, filters):
+        """
+        Returns rows of the resident data matching filters
+        """
+        key = tuple(filters)
+        df = self.frames.get(key)
+        if df is None:
+            try:
+                mask = util.filter_mask(self.df, filters)
+            except KeyError as e:
+                raise BadRequest(f'Unknown filter column {e}')
+            df = self.df if mask.all() else self.df[mask]
+            self.frames.put(key, df)
+        return df
+
+    def cached(self, kind, spec, function, cfg=None):
+        key = (kind, spec_key(spec))
+        result = self.results.get(key)
+        if result is None:
+            result = function(cfg or self.settings(spec))
+            self.results.put(key, result)
+        return result
+
+    def plot(self, spec):
+        """
+        Returns content type and image of a plot spec, in the format of
+        the request or else of the command line
+        """
+        cfg = self.settings(spec)
+        cfg['format'] = cfg.get('format') or 'png'
+        if cfg['format'] not in PLOT_TYPES:
+            raise BadRequest(f"Unknown plot format {cfg['format']}")
+        return PLOT_TYPES[cfg['format']], self.cached(
+            'plot', spec, self.render_plot, cfg
+        )
+
+    def render_plot(self, cfg):
+        from .main import figure_size, get_palette
+        from .plotters import plotters
+
+        if cfg['plot_type'] not in plotters:
+            raise BadRequest(f"Unknown plot type {cfg['plot_type']}")
+        if not isinstance(cfg['num'], str):
+            raise BadRequest('Plots of a single numerical only')
+        df = self.filtered(cfg['filters'])
+        cfg.setdefault('title', ' '.join(cfg['filters']))
+        buffer = io.BytesIO()
+        with self.render_lock:
+            plotter = plotters[cfg['plot_type']](
+                df.copy(deep=False),
+                cfg['num'],
+                categorical=cfg.get('cat'),
+                hue=cfg.get('hue'),
+                hue_order=cfg.get('hue_order'),
+                filters=cfg['filters'],
+                annotate=cfg.get('annotate', ()),
+                palette=get_palette(cfg),
+                interactive=False,
+                cfg=cfg,
+            )
+            try:
+                plotter.plot(**cfg)
+                plotter.ax.grid(True)
+                if cfg.get('size'):
+                    plotter.fig.set_size_inches(figure_size(cfg['size']))
+                plotter.fig.savefig(
+                    buffer, format=cfg['format'],
+                    dpi=float(cfg['dpi']) if cfg.get('dpi') else None,
+                )
+            finally:
+                plt.close('all')
+        return buffer.getvalue()
+
+    def table(self, spec):
+        """
+        Returns content type and statistics table of a spec as csv or json
+        """
+        fmt = spec.get('format', 'csv')
+        if fmt not in TABLE_TYPES:
+            raise BadRequest(f'Unknown table format {fmt}')
+        return TABLE_TYPES[fmt], self.cached('table', spec, self.render_table)
+
+    def render_table(self, cfg):
+        from .main import compute_table
+
+        table = compute_table(self.filtered(cfg['filters']), cfg)
+        if cfg.get('format') == 'json':
+            table.index = [
+                list(key) if isinstance(key, tuple) else key
+                for key in table.index
+            ]
+            return table.to_json(orient='split').encode()
+        return table.to_csv().encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    routes = {'/plot': App.plot, '/table': App.table}
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == '/health':
+            return self.send('text/plain', b'ok')
+        if url.path not in self.routes:
+            return self.send_error(404)
+        try:
+            content_type, body = self.routes[url.path](
+                self.server.app, parse_spec(url.query)
+            )
+        except BadRequest as e:
+            return self.send_json_error(e, 400)
+        except Exception as e:
+            self.log_error('%s: %s', type(e).__name__, e)
+            return self.send_json_error(e, 500)
+        self.send(content_type, body)
+
+    def send_json_error(self, error, status):
+        body = json.dumps({'error': str(error)}).encode()
+        self.send('application/json', body, status=status)
+
+    def send(self, content_type, body, status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(app, host='127.0.0.1', port=0, quiet=False):
+    """
+    Returns a threading server of app, port 0 picks a free port
+    """
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.app = app
+    server.quiet = quiet
+    return server
+
+
+def serve(cfg):
+    """
+    Load data once and serve plots and tables until interrupted
+    """
+    from .main import select_backend, load_data
+
+    select_backend({})
+    # all columns, requests may plot or filter any of them
+    df = load_data(cfg, specs=[{'show': True}])
+    entries = int(cfg.get('serve_cache') or DEFAULT_ENTRIES)
+    app = App(df, cfg, entries=entries)
+    server = make_server(
+        app, cfg.get('host') or '127.0.0.1', int(cfg['serve'])
+    )
+    host, port = server.server_address[:2]
+    print(f'Serving {cfg["data"]} on http://{host}:{port}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,271 @@
+"""
+Mergeable quantile sketches for approximate tables
+"""
+import json
+import math
+import random
+
+import numpy as np
+import pandas as pd
+
+from . import stats
+
+
+class KLL:
+    """
+    KLL quantile sketch
+
+    Values are kept in a hierarchy of compactors, an item at level h standing
+    for 2**h values. A full compactor sorts its items and promotes every
+    other one to the next level. The memory use is O(k) and quantile ranks
+    are within rank_error() of the exact ranks with high probability.
+
+    Count, mean, variance, min and max are tracked exactly.
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.c = 2 / 3
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.random = random.Random(seed)
+
+    def capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(int(math.ceil(self.k * self.c ** depth)), 2)
+
+    def update(self, values):
+        """
+        Add an array of values, NaN values are ignored
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.add_moments(
+            len(values), values.mean(), ((values - values.mean()) ** 2).sum(),
+            values.min(), values.max(),
+        )
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.compress()
+
+    def add_moments(self, count, mean, m2, low, high):
+        """
+        Combine exact moments, as in the parallel variance algorithm
+        """
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    def compress(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) >= self.capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[h])
+                odd = len(items) % 2
+                offset = self.random.randint(0, 1)
+                self.levels[h] = items[:odd]
+                self.levels[h + 1] = np.concatenate(
+                    [self.levels[h + 1], items[odd + offset::2]]
+                )
+            h += 1
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one
+        """
+        if other.count == 0:
+            return self
+        self.add_moments(
+            other.count, other.mean, other.m2, other.min, other.max
+        )
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.compress()
+        return self
+
+    def exact(self):
+        return len(self.levels) == 1
+
+    def rank_error(self):
+        """
+        Normalized rank error bound, 99% confidence as for DataSketches KLL
+        """
+        if self.exact():
+            return 0.0
+        return 2.296 / self.k ** 0.9723
+
+    def quantiles(self, percentiles):
+        """
+        Returns approximate values at percentiles
+        """
+        if self.count == 0:
+            return np.full(len(percentiles), np.nan)
+        if self.exact():
+            return np.percentile(
+                self.levels[0], np.multiply(percentiles, 100)
+            )
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level), 2 ** h) for h, level in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind='stable')
+        items, weights = items[order], weights[order]
+        cumulative = np.cumsum(weights)
+        positions = np.multiply(percentiles, cumulative[-1] - 1) + 1
+        found = np.searchsorted(cumulative, positions)
+        values = items[np.minimum(found, len(items) - 1)]
+        values[np.equal(percentiles, 0)] = self.min
+        values[np.equal(percentiles, 1)] = self.max
+        return values
+
+    def describe(self, percentiles):
+        """
+        Returns statistics in the order of stats.columns
+        """
+        if self.count > 1:
+            std = math.sqrt(self.m2 / (self.count - 1))
+        else:
+            std = np.nan
+        mean = self.mean if self.count else np.nan
+        low = self.min if self.count else np.nan
+        high = self.max if self.count else np.nan
+        return [
+            self.count, mean, std, low, *self.quantiles(percentiles), high
+        ]
+
+    def to_dict(self):
+        return dict(
+            k=self.k, count=self.count, mean=self.mean, m2=self.m2,
+            min=self.min, max=self.max,
+            levels=[items.tolist() for items in self.levels],
+        )
+
+    @classmethod
+    def from_dict(cls, d):
+        sketch = cls(d['k'])
+        sketch.count = d['count']
+        sketch.mean = d['mean']
+        sketch.m2 = d['m2']
+        sketch.min = d['min']
+        sketch.max = d['max']
+        sketch.levels = [
+            np.array(items, dtype=float) for items in d['levels']
+        ]
+        return sketch
+
+
+class Sketches:
+    """
+    Quantile sketches per table row, keyed as the rows of stats.table
+    """
+
+    def __init__(self, k=200):
+        self.k = k
+        self.sketches = {}
+
+    def sketch(self, key):
+        if key not in self.sketches:
+            self.sketches[key] = KLL(self.k)
+        return self.sketches[key]
+
+    def update(self, df, numerical, categorical=None, hue=None):
+        """
+        Add the values of a frame, grouped as in stats.table
+        """
+        self.sketch(stats.TOTAL).update(df[numerical])
+        if categorical:
+            grouped = df.groupby(categorical, observed=True)[numerical]
+            for cat, values in grouped:
+                if hue:
+                    self.sketch((cat, stats.TOTAL)).update(values)
+                else:
+                    self.sketch(cat).update(values)
+            if hue:
+                grouped = df.groupby(
+                    [categorical, hue], observed=True
+                )[numerical]
+                for key, values in grouped:
+                    self.sketch(key).update(values)
+        return self
+
+    def merge(self, other):
+        for key, sketch in other.sketches.items():
+            self.sketch(key).merge(sketch)
+        return self
+
+    def rank_error(self):
+        return max(
+            (s.rank_error() for s in self.sketches.values()), default=0.0
+        )
+
+    def keys(self):
+        """
+        Table row order: categories and hues sorted, totals last
+        """
+        def order(key):
+            if isinstance(key, tuple):
+                return (0, key[0], key[1] == stats.TOTAL, key[1])
+            return (key == stats.TOTAL, key)
+        keys = list(self.sketches)
+        try:
+            return sorted(keys, key=order)
+        except TypeError:
+            return keys
+
+    def describe(self, percentiles=None):
+        """
+        Returns approximate statistics table, rank error in attrs
+        """
+        percentiles = stats.parse_percentiles(percentiles)
+        keys = self.keys()
+        rows = [self.sketches[key].describe(percentiles) for key in keys]
+        if keys == [stats.TOTAL]:
+            index = pd.Index(keys, name='alla')
+        else:
+            index = pd.Index(keys, tupleize_cols=False)
+        table = pd.DataFrame(
+            rows, index=index, columns=stats.columns(percentiles), dtype=float
+        )
+        table.attrs['rank_error'] = self.rank_error()
+        return table
+
+    def save(self, path):
+        items = [
+            [list(key) if isinstance(key, tuple) else key, sketch.to_dict()]
+            for key, sketch in self.sketches.items()
+        ]
+        with open(path, 'w') as f:
+            json.dump(dict(k=self.k, sketches=items), f, default=_json)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            d = json.load(f)
+        sketches = cls(d['k'])
+        for key, sketch in d['sketches']:
+            if isinstance(key, list):
+                key = tuple(key)
+            sketches.sketches[key] = KLL.from_dict(sketch)
+        return sketches
+
+
+def _json(value):
+    """
+    Numpy scalars in group keys
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'{type(value)} is not JSON serializable')
@@ -0,0 +1,191 @@
+"""
+Grouped descriptive statistics from a single sort
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+TOTAL = 'Alla'
+
+
+def parse_percentiles(percentiles):
+    """
+    Returns percentiles as a tuple of floats, default if none given
+
+    >>> parse_percentiles('0.1 0.9')
+    (0.1, 0.9)
+    """
+    if not percentiles:
+        return DEFAULT_PERCENTILES
+    if isinstance(percentiles, str):
+        percentiles = percentiles.replace(',', ' ').split()
+    return tuple(sorted(float(p) for p in percentiles))
+
+
+def columns(percentiles):
+    """
+    Returns statistics labels as in DataFrame.describe
+    """
+    return (
+        ['count', 'mean', 'std', 'min']
+        + [f'{100 * p:g}%' for p in percentiles]
+        + ['max']
+    )
+
+
+class SortedValues:
+    """
+    Numerical values sorted once, grouped by stable sorts of integer codes
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=float)
+        self.valid = ~np.isnan(values)
+        self.order = np.flatnonzero(self.valid)[
+            np.argsort(values[self.valid], kind='stable')
+        ]
+        self.values = values[self.order]
+
+    def describe(self, codes, ngroups, percentiles):
+        """
+        Returns array of statistics per group, one row per code
+
+        Rows with negative codes are left out
+        """
+        codes = np.asarray(codes)[self.order]
+        grouped = np.argsort(codes, kind='stable')
+        codes = codes[grouped]
+        values = self.values[grouped]
+        skip = np.searchsorted(codes, 0)
+        codes, values = codes[skip:], values[skip:]
+
+        counts = np.bincount(codes, minlength=ngroups)
+        starts = np.cumsum(counts) - counts
+        ends = starts + counts - 1
+        nonempty = counts > 0
+
+        stats = np.full((ngroups, len(percentiles) + 5), np.nan)
+        stats[:, 0] = counts
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.bincount(codes, weights=values, minlength=ngroups)
+            mean = mean.astype(float) / counts
+            squares = np.bincount(
+                codes, weights=(values - mean[codes]) ** 2, minlength=ngroups
+            )
+            stats[:, 1] = mean
+            stats[:, 2] = np.where(
+                counts > 1, np.sqrt(squares / (counts - 1)), np.nan
+            )
+        stats[nonempty, 3] = values[starts[nonempty]]
+        stats[nonempty, -1] = values[ends[nonempty]]
+        for i, p in enumerate(percentiles, start=4):
+            stats[nonempty, i] = interpolate(
+                values, starts[nonempty], counts[nonempty], p
+            )
+        return stats
+
+
+def interpolate(values, starts, counts, p):
+    """
+    Linear interpolation of percentile p in sorted segments, as numpy does
+    """
+    position = p * (counts - 1)
+    below = np.floor(position).astype(np.int64)
+    above = np.minimum(below + 1, counts - 1)
+    t = position - below
+    a = values[starts + below]
+    b = values[starts + above]
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def factorize(column):
+    """
+    Returns integer codes and sorted distinct values of a column
+    """
+    try:
+        return pd.factorize(column, sort=True)
+    except TypeError:
+        return pd.factorize(column)
+
+
+def grouping(df, categorical=None, hue=None):
+    """
+    Returns the grouping levels of a table, as integer codes and number of
+    groups, and the level, group and key of each table row
+
+    Rows are per category and subcategory (hue), per category when there is
+    a hue, and for all rows
+    """
+    levels, order, keys = [], [], []
+
+    if categorical:
+        cat_codes, cat_values = factorize(df[categorical])
+        levels.append((cat_codes, len(cat_values)))
+        if hue:
+            hue_codes, hue_values = factorize(df[hue])
+            observed = (cat_codes >= 0) & (hue_codes >= 0)
+            combined = np.where(
+                observed, cat_codes * len(hue_values) + hue_codes, -1
+            )
+            pairs, pair_codes = np.unique(
+                combined[observed], return_inverse=True
+            )
+            codes = np.full(len(df), -1)
+            codes[observed] = pair_codes
+            levels.append((codes, len(pairs)))
+            for i, cat in enumerate(cat_values):
+                in_cat = pairs // len(hue_values) == i
+                for j in np.flatnonzero(in_cat):
+                    keys.append(
+                        (cat, hue_values[pairs[j] % len(hue_values)])
+                    )
+                    order.append((1, j))
+                if in_cat.any():
+                    keys.append((cat, TOTAL))
+                    order.append((0, i))
+        else:
+            keys.extend(cat_values)
+            order.extend((0, i) for i in range(len(cat_values)))
+
+    levels.append((np.zeros(len(df), dtype=np.int64), 1))
+    keys.append(TOTAL)
+    order.append((len(levels) - 1, 0))
+    return levels, order, keys
+
+
+def table(df, numerical, categorical=None, hue=None, percentiles=None):
+    """
+    Returns descriptive statistics of numerical
+
+    Statistics are given per category and subcategory (hue), per category
+    when there is a hue, and for all rows. All grouping levels are computed
+    from the same sorted values. The frame is not modified.
+
+    With a list of numericals the rows are grouped once and the statistics
+    of each numerical form a column group
+    """
+    percentiles = parse_percentiles(percentiles)
+    levels, order, keys = grouping(df, categorical, hue)
+
+    if categorical:
+        index = pd.Index(keys, tupleize_cols=False)
+    else:
+        index = pd.Index(keys, name='alla')
+
+    tables = []
+    for name in [numerical] if isinstance(numerical, str) else numerical:
+        values = SortedValues(df[name])
+        described = [
+            values.describe(codes, ngroups, percentiles)
+            for codes, ngroups in levels
+        ]
+        rows = [described[level][group] for level, group in order]
+        tables.append(pd.DataFrame(
+            np.array(rows).reshape(len(keys), -1),
+            index=index,
+            columns=columns(percentiles),
+        ))
+    if isinstance(numerical, str):
+        return tables[0]
+    return pd.concat(tables, axis=1, keys=list(numerical))
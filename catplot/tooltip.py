@@ -0,0 +1,101 @@
+"""
+Blitted hover annotation
+"""
+
+ANNOTATION_STYLE = dict(
+    textcoords="offset points",
+    bbox={
+        "boxstyle": "square",
+        "fc": "w",
+        "lw": 2,
+        "pad": 0.6,
+    },
+    arrowprops={"arrowstyle": "->"},
+    size="x-large",
+)
+
+
+class Tooltip:
+    """
+    A single annotation artist reused for every hover event
+
+    The static figure is cached as a background image on each full draw and
+    only the annotation is blitted on top of it. Requests arriving faster
+    than the refresh interval are coalesced so only the latest is rendered.
+    """
+
+    def __init__(self, ax, xytext=(-50, 50), interval=16):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.annotation = ax.annotate(
+            "", xy=(0, 0), xytext=xytext, animated=True, visible=False,
+            **ANNOTATION_STYLE
+        )
+        self.background = None
+        self.state = None
+        self.pending = None
+        self.scheduled = False
+        self.timer = self.canvas.new_timer(interval=interval)
+        self.timer.single_shot = True
+        self.timer.add_callback(self.flush)
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def show(self, text, xy):
+        """
+        Request the annotation to display text at data coordinates xy
+        """
+        self.request((text, tuple(xy)))
+
+    def hide(self):
+        """
+        Request the annotation to be hidden
+        """
+        self.request(None)
+
+    def request(self, state):
+        """
+        Record the latest requested state and schedule a render
+        """
+        self.pending = state
+        if self.pending == self.state:
+            return
+        if not self.scheduled:
+            self.scheduled = True
+            self.timer.start()
+
+    def flush(self):
+        """
+        Render the latest requested state
+        """
+        self.scheduled = False
+        if self.pending == self.state:
+            return
+        self.state = self.pending
+        if self.state is None:
+            self.annotation.set_visible(False)
+        else:
+            text, xy = self.state
+            self.annotation.set_text(text)
+            self.annotation.xy = xy
+            self.annotation.set_visible(True)
+        self.blit()
+
+    def blit(self):
+        """
+        Restore the cached background and draw the annotation on top
+        """
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        if self.annotation.get_visible():
+            self.ax.draw_artist(self.annotation)
+        self.canvas.blit(self.ax.figure.bbox)
+
+    def on_draw(self, event):
+        """
+        Cache the static figure after a full redraw
+        """
+        self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        if self.annotation.get_visible():
+            self.ax.draw_artist(self.annotation)
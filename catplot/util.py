@@ -1,65 +1,124 @@
+from collections import namedtuple
+import functools
 import re
 
+from .lazy import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+
+Term = namedtuple('Term', ['key', 'op', 'value', 'raw'])
+
+
+@functools.lru_cache(maxsize=256)
+def compile_filters(filters: tuple) -> tuple:
+    """
+    Parses filter strings once into a tuple of terms
+
+    >>> compile_filters(('kr>0',))
+    (Term(key='kr', op='>', value=0, raw='0'),)
+    """
+    terms = []
+    for kv in filters:
+        if '!=' in kv:
+            k, v = kv.split('!=')
+            terms.append(Term(k, '!=', re.sub('_', ' ', v), v))
+        elif '<=' in kv:
+            k, v = kv.split('<=')
+            terms.append(Term(k, '<=', v, v))
+        elif '=' in kv:
+            k, v = kv.split('=')
+            terms.append(Term(k, '=', re.sub('_', ' ', v), v))
+        elif '>' in kv:
+            k, v = kv.split('>')
+            terms.append(Term(k, '>', _try_int(v), v))
+        elif '<' in kv:
+            k, v = kv.split('<')
+            terms.append(Term(k, '<', _try_int(v), v))
+        elif '@' in kv:
+            k, v = kv.split('@')
+            values = tuple(re.sub('_', ' ', v) for v in v.split(':'))
+            terms.append(Term(k, '@', values, v))
+        elif '.match.' in kv:
+            k, v = kv.split('.match.')
+            v = re.sub('_', ' ', v)
+            terms.append(Term(k, '.match.', fr'.*{v}.*', v))
+    return tuple(terms)
+
+
+def _try_int(v):
+    try:
+        return int(v)
+    except ValueError:
+        return v
+
+
+def term_mask(df, term):
+    """
+    Returns boolean array of rows in df satisfying a filter term
+
+    Terms on categorical columns are evaluated once per category
+    """
+    column = df[term.key]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = pd.Series(column.cat.categories)
+        numeric = isinstance(_try_int(term.raw), int)
+        if term.op in ('<', '>', '<=') and numeric:
+            categories = pd.to_numeric(categories, errors='coerce')
+            term = term._replace(value=int(term.raw))
+        missing = term.op == '!='
+        hits = np.append(_term_mask(categories, term), missing)
+        return hits[column.cat.codes.to_numpy()]
+    return _term_mask(column, term)
+
+
+def _term_mask(column, term):
+    value = term.value
+    if term.op in ('!=', '<=', '=') and is_integer(column):
+        value = int(term.raw)
+
+    if term.op == '!=':
+        mask = column != value
+    elif term.op == '<=':
+        mask = column <= value
+    elif term.op == '=':
+        mask = column == value
+    elif term.op == '>':
+        mask = column > value
+    elif term.op == '<':
+        mask = column < value
+    elif term.op == '@':
+        mask = column.isin(value)
+    elif term.op == '.match.':
+        mask = column.notna() & column.str.match(value)
+    return mask.to_numpy(dtype=bool, na_value=False)
+
+
+def is_integer(column):
+    return pd.api.types.is_integer_dtype(column.dtype)
+
+
+def filter_mask(df, filters):
+    """
+    Returns the conjunction of all filter terms as one boolean array
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for term in compile_filters(tuple(filters)):
+        mask &= term_mask(df, term)
+    return mask
+
 
 def process_filters(df, filters):
+    if not compile_filters(tuple(filters)):
+        return df
     try:
-        for kv in filters:
-            if '!=' in kv:
-                k, v = kv.split('!=')
-                if df[k].dtype == int:
-                    try:
-                        v = int(v)
-                    except ValueError:
-                        raise
-                else:
-                    v = re.sub('_', ' ', v)
-                df = df[df[k] != v]
-            elif '<=' in kv:
-                k, v = kv.split('<=')
-                if df[k].dtype == int:
-                    try:
-                        v = int(v)
-                    except ValueError:
-                        raise
-                df = df[df[k] <= v]
-            elif '=' in kv:
-                k, v = kv.split('=')
-                if df[k].dtype == int:
-                    try:
-                        v = int(v)
-                    except ValueError:
-                        raise
-                else:
-                    v = re.sub('_', ' ', v)
-                df = df[df[k] == v]
-            elif '>' in kv:
-                k, v = kv.split('>')
-                try:
-                    v = int(v)
-                except ValueError:
-                    pass
-                df = df[df[k] > v]
-            elif '<' in kv:
-                k, v = kv.split('<')
-                try:
-                    v = int(v)
-                except ValueError:
-                    pass
-                df = df[df[k] < v]
-            elif '@' in kv:
-                k, v = kv.split('@')
-                values = v.split(':')
-                values = [re.sub('_', ' ', v) for v in values]
-                df = df[df[k].isin(values)]
-            elif '.match.' in kv:
-                k, v = kv.split('.match.')
-                v = re.sub('_', ' ', v)
-                df = df[df[k].notna() & df[k].str.match(fr'.*{v}.*')]
+        mask = filter_mask(df, filters)
     except KeyError:
         print('Available columns:', df.columns)
         exit(1)
 
-    return df
+    return df[mask]
 
 
 REGEX = r'([/\s\w.()]+)[=>@]([-\s\w():,]+)'
@@ -102,6 +161,11 @@ def filter_dict(filters: list) -> dict:
     'Arbomr'
     """
 
+    return dict(_filter_dict(tuple(filters)))
+
+
+@functools.lru_cache(maxsize=256)
+def _filter_dict(filters: tuple) -> tuple:
     keys = [filter_keys(s) for s in filters]
     values = []
     for s in filters:
@@ -111,4 +175,53 @@ def filter_dict(filters: list) -> dict:
         else:
             values.append(value)
 
-    return {k: v for k, v in zip(keys, values)}
+    return tuple(zip(keys, values))
+
+
+def compact(df, max_ratio=0.5):
+    """
+    Returns df with smaller dtypes
+
+    Integers are downcast to the smallest type holding their range, floats
+    to float32 where no value changes, and string columns with at most
+    max_ratio distinct values per row become categoricals
+    """
+    columns = {}
+    for name, column in df.items():
+        kind = column.dtype.kind
+        if kind in 'iu':
+            columns[name] = pd.to_numeric(column, downcast=(
+                'unsigned' if kind == 'u' else 'integer'
+            ))
+        elif kind == 'f' and column.dtype.itemsize > 4:
+            single = column.astype(np.float32)
+            values = column.to_numpy()
+            exact = single.to_numpy(dtype=float) == values
+            if (exact | np.isnan(values)).all():
+                columns[name] = single
+        elif kind == 'O' and len(column):
+            distinct = column.nunique(dropna=True)
+            if distinct <= max_ratio * len(column):
+                columns[name] = column.astype('category')
+    if not columns:
+        return df
+    # shallow copy, unchanged columns are shared with df
+    df = df.copy(deep=False)
+    for name, column in columns.items():
+        df[name] = column
+    return df
+
+
+def memory_report(before, after):
+    """
+    Returns bytes used per column by frames before and after compaction,
+    with dtypes after and totals
+    """
+    report = pd.DataFrame({
+        'before': before.memory_usage(deep=True),
+        'after': after.memory_usage(deep=True),
+    })
+    report['dtype'] = after.dtypes.astype(str).reindex(report.index)
+    report.loc['total'] = [report.before.sum(), report.after.sum(), '']
+    report['ratio'] = (report.after / report.before).round(2)
+    return report
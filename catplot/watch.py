@@ -0,0 +1,196 @@
+"""
+Re-render when the data, corrections or configuration files change
+
+Only the stages whose inputs changed are run again: a changed data file is
+parsed again, changed corrections are applied to the parsed data already
+in memory, and changed settings (e.g. filters) re-render the corrected
+data. With --display the open figure is redrawn in place.
+"""
+import os
+import sys
+import time
+
+from . import corrections, profile
+from .lazy import LazyModule
+
+plt = LazyModule('matplotlib.pyplot')
+
+DEFAULT_INTERVAL = 1.0
+EVENTS = ('button_press_event', 'motion_notify_event', 'draw_event')
+
+
+def signature(path):
+    """
+    Returns modification time and size of a file, None if it is missing
+
+    A list of files has a tuple of signatures
+    """
+    if isinstance(path, list):
+        return tuple(signature(p) for p in path)
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def connections(canvas):
+    """
+    Returns ids of the canvas callbacks a plotter connects
+    """
+    callbacks = canvas.callbacks.callbacks
+    return {cid for event in EVENTS for cid in callbacks.get(event, {})}
+
+
+class Watcher:
+    """
+    Parsed and corrected data kept between runs, invalidated by file changes
+    """
+
+    def __init__(self, cfg, settings=None):
+        self.cfg = cfg
+        self.settings = settings
+        self.raw = None
+        self.corrected = None
+        self.signatures = {}
+        self.ax = None
+        self.connected = set()
+        self.rendered = False
+
+    def files(self):
+        from .main import data_files
+
+        data = self.cfg.get('data')
+        return {
+            # patterns are expanded again, a new snapshot is a change
+            'data': data_files(data) if data else None,
+            'korr': corrections.DEFAULT_FILE,
+            'config': self.cfg.get('ini', 'config.ini'),
+        }
+
+    def changed(self):
+        """
+        Returns names of watched files changed since last call
+        """
+        changed = set()
+        for name, path in self.files().items():
+            current = signature(path)
+            if self.signatures.get(name, ()) != current:
+                changed.add(name)
+            self.signatures[name] = current
+        return changed
+
+    def reload_settings(self):
+        """
+        Read settings again, True if they changed
+        """
+        if self.settings is None:
+            return False
+        cfg = self.settings()
+        if cfg == self.cfg:
+            return False
+        if cfg.get('data') != self.cfg.get('data'):
+            self.raw = None
+        self.cfg = cfg
+        return True
+
+    def step(self, changed):
+        """
+        Run the stages invalidated by the changed files, True if rendered
+        """
+        from .main import compact_data, parse_data, get_cache
+
+        if not changed:
+            return False
+        if 'config' in changed and self.rendered:
+            if not self.reload_settings() and changed == {'config'}:
+                return False
+        if 'data' in changed:
+            self.raw = None
+        if self.raw is None or 'korr' in changed:
+            self.corrected = None
+
+        if self.raw is None:
+            with profile.stage('load') as record:
+                self.raw = parse_data(
+                    self.cfg['data'],
+                    cache=get_cache(self.cfg),
+                    refresh=self.cfg.get('refresh_cache'),
+                )
+                record['rows'] = len(self.raw)
+        if self.corrected is None:
+            korr = corrections.load()
+            corrected = self.raw.copy()
+            if korr is not None:
+                korr.apply(corrected)
+            self.corrected = compact_data(corrected, self.cfg)
+        self.render()
+        self.rendered = True
+        return True
+
+    def render(self):
+        from .main import render
+
+        if self.cfg.get('display'):
+            fig = plt.gcf() if self.ax is None else self.ax.figure
+            for cid in self.connected:
+                fig.canvas.mpl_disconnect(cid)
+            fig.clf()
+            self.ax = fig.add_subplot()
+            before = connections(fig.canvas)
+        render(self.corrected.copy(deep=False), dict(self.cfg), ax=self.ax)
+        if self.ax is None:
+            plt.close('all')
+        else:
+            self.connected = connections(self.ax.figure.canvas) - before
+            self.ax.figure.canvas.draw_idle()
+
+    def wait(self, interval):
+        """
+        Sleep between polls, running the GUI event loop of a displayed plot
+
+        Returns False when the plot window was closed
+        """
+        if self.ax is None:
+            time.sleep(interval)
+            return True
+        if not plt.fignum_exists(self.ax.figure.number):
+            return False
+        plt.pause(interval)
+        return True
+
+
+def watch(cfg, settings=None, interval=None, runs=None):
+    """
+    Render, then poll the watched files and re-render on changes
+
+    settings is called to read settings again when the config file changes.
+    Errors, e.g. of a half saved file, are reported and the previous plot is
+    kept until the next change. Stops after runs renders if given, when the
+    plot window is closed or on keyboard interrupt
+    """
+    interval = float(
+        interval or cfg.get('watch_interval') or DEFAULT_INTERVAL
+    )
+    watcher = Watcher(cfg, settings)
+    if cfg.get('display'):
+        plt.ion()
+    rendered = 0
+    try:
+        while runs is None or rendered < runs:
+            try:
+                stepped = watcher.step(watcher.changed())
+            except Exception as e:
+                print(f'Not rendered: {type(e).__name__}: {e}',
+                      file=sys.stderr, flush=True)
+                stepped = False
+            if stepped:
+                rendered += 1
+                print(f"Rendered {watcher.cfg['data']}", flush=True)
+            if runs is not None and rendered >= runs:
+                break
+            if not watcher.wait(interval):
+                break
+    except KeyboardInterrupt:
+        pass
+    return watcher
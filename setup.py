@@ -3,7 +3,8 @@ from setuptools import setup
 setup(
     name="catplot",
     packages=["catplot"],
-    install_requires=["pandas", "seaborn", "xlrd", "openpyxl", "pyqt5"],
+    install_requires=["pandas", "seaborn", "xlrd", "openpyxl"],
+    extras_require={"gui": ["pyqt5"]},
     scripts=[
         "scripts/boxplot",
         "scripts/boxplot-demo",
@@ -30,6 +30,16 @@ def df():
     return _df
 
 
+@pytest.fixture
+def workdir(tmp_path, monkeypatch, df):
+    """
+    Working directory with df exported to export.csv
+    """
+    df.to_csv(tmp_path / 'export.csv', index=False)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
 @pytest.fixture
 def active(df):
     return df[df.kr > 0]
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from catplot import batch
+
+
+@pytest.fixture
+def manifest(workdir):
+    manifest = [
+        {'plot_type': 'box', 'num': 'kr', 'cat': 'school'},
+        {'plot_type': 'point', 'num': ['kr'], 'cat': 'km',
+         'filters': ['school=B']},
+    ]
+    (workdir / 'manifest.json').write_text(json.dumps(manifest))
+    return 'manifest.json'
+
+
+def test_plot_settings():
+    cfg = {'data': 'export.csv', 'filters': ['kr>0'], 'batch': 'm.json'}
+    spec = {'num': ['kr'], 'cat': 'km', 'filters': ['school=B']}
+    assert batch.plot_settings(cfg, spec) == {
+        'data': 'export.csv',
+        'num': 'kr',
+        'cat': 'km',
+        'filters': ['kr>0', 'school=B'],
+    }
+
+
+def test_read_manifest_object(tmp_path):
+    path = tmp_path / 'manifest.json'
+    path.write_text(json.dumps({'plots': [{'num': 'kr'}]}))
+    assert batch.read_manifest(path) == [{'num': 'kr'}]
+
+
+def test_run_batch(workdir, manifest):
+    cfg = {'data': 'export.csv', 'no_cache': True, 'filters': ['kr>0']}
+    files = batch.run_batch(cfg, manifest, jobs=2)
+    assert files == [
+        ('box-kr-school-0.png', 'tab-kr-school-0.csv'),
+        ('point-kr-km-0_B.png', 'tab-kr-km-0_B.csv'),
+    ]
+    for figure_file, csv_file in files:
+        assert (workdir / figure_file).exists()
+        assert (workdir / csv_file).exists()
+        assert (workdir / csv_file.replace('.csv', '.xlsx')).exists()
+
+
+def test_plot_settings_savefig():
+    cfg = {'data': 'export.csv', 'savefig': 'fig.png'}
+    assert 'savefig' not in batch.plot_settings(cfg, {'num': 'kr'})
+    assert batch.plot_settings(cfg, {'num': 'kr', 'savefig': 'kr.png'})[
+        'savefig'
+    ] == 'kr.png'
@@ -0,0 +1,44 @@
+import json
+
+import pandas.testing as pdt
+
+from benchmarks import compare, synthetic
+
+
+def test_payroll_deterministic():
+    pdt.assert_frame_equal(synthetic.payroll(500), synthetic.payroll(500))
+    assert not synthetic.payroll(500, seed=1).equals(synthetic.payroll(500))
+
+
+def test_payroll_cardinalities():
+    df = synthetic.payroll(20000)
+    assert len(df) == 20000
+    assert df['Skola'].nunique() == len(synthetic.SCHOOLS)
+    assert df['Kön'].nunique() == 2
+    assert 50 < df['Benämning'].nunique() <= len(synthetic.TITLES)
+    assert df['Efternamn'].nunique() > 1000
+    assert (df['Bef tom'] > df['Bef fr']).all()
+
+
+def test_write(tmp_path):
+    data, korr = synthetic.write(tmp_path, 2000)
+    assert data.exists()
+    from catplot.corrections import Corrections
+    assert len(Corrections.read(korr)) == 2
+
+
+def test_compare(tmp_path):
+    def report(path, seconds):
+        path.write_text(json.dumps(dict(
+            meta=dict(commit='abc'),
+            results=[
+                dict(rows=1000, stage='plot', seconds=seconds, output_rows=1)
+            ],
+        )))
+        return str(path)
+
+    base = report(tmp_path / 'base.json', 1.0)
+    same = report(tmp_path / 'same.json', 1.1)
+    slow = report(tmp_path / 'slow.json', 2.0)
+    assert compare.main([base, same]) == 0
+    assert compare.main([base, slow]) == 1
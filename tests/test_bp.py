@@ -185,7 +185,106 @@ def test_y_shift_3(plxzy):
     )
 
 
+def test_y_shift_hue_order(df):
+    plotter = BoxPlotter(
+        df, "kr", categorical="school", hue="km", hue_order=["Man", "Kvinna"]
+    )
+    shift = plotter.y_shift()
+    assert (shift[plotter.df.km == "Man"] == -0.2).all()
+    assert (shift[plotter.df.km == "Kvinna"] == 0.2).all()
+    pdt.assert_series_equal(
+        shift, plotter.y - plotter.y.round(), check_names=False
+    )
+
+
 def test_no_hue(plxy):
     pdt.assert_series_equal(
         plxy.y_shift(), pd.Series(np.zeros(10), index=plxy.df.index)
     )
+
+
+@mock.patch("catplot.plotters.plt.show")
+def test_plot_stats_renderer(mock_show, plxyz):
+    with mock.patch("catplot.plotters.sns.boxplot") as mockplot:
+        plxyz.plot(box_renderer="stats")
+        mockplot.assert_not_called()
+    assert len(plxyz.ax.patches) == 3
+
+
+def test_stats_renderer_shares_table(plxyz):
+    plxyz.plot(box_renderer="stats")
+    assert plxyz.table() is plxyz.table()
+    assert len(plxyz._tables) == 1
+
+
+def test_outliers(plxy):
+    categories = ["A", "B", "C"]
+    low = np.array([30000, 30000, 0])
+    high = np.array([35000, 35000, 40000])
+    fliers = plxy.outliers(categories, [None], low, high)
+    assert fliers[0].tolist() == [39648, 29225, 35832]
+    assert fliers[1].tolist() == [22732, 29845]
+    assert fliers[2].tolist() == []
+
+
+def test_levels_computed_once(df):
+    plotter = BoxPlotter(df, "kr", categorical="school", hue="km")
+    plotter.y
+    with mock.patch("catplot.plotters.sorted_labels") as labels:
+        plotter.categorical_values()
+        plotter.hue_values()
+        plotter.plot()
+    labels.assert_not_called()
+
+
+def test_levels_filter_order(df):
+    filters = ["school@C:A"]
+    plotter = BoxPlotter(
+        df[df.school.isin(["A", "C"])].copy(), "kr", categorical="school",
+        hue="km", filters=filters,
+    )
+    assert plotter.categorical_values() == ["C", "A"]
+    assert set(plotter.y.round()) == {0, 1}
+    assert (plotter.y[plotter.df.school == "C"].round() == 0).all()
+
+
+def test_levels_single_value_filter(df):
+    plotter = BoxPlotter(
+        df.assign(school="CBH"), "kr", categorical="school", hue="km",
+        filters=["school=CBH"],
+    )
+    assert plotter.categorical_values() == ["CBH"]
+    # all points in the single category slot, shifted by hue level
+    assert (plotter.y.abs() < 0.4).all()
+    assert plotter.y.round(2).nunique() == len(plotter.hue_values())
+
+
+def test_frame_not_modified(df):
+    columns = list(df.columns)
+    plotter = BoxPlotter(df, "kr", categorical="school", hue="km")
+    assert list(df.columns) == columns
+    assert df.school.dtype == object
+    assert plotter.df.school.dtype == "category"
+
+
+def test_events_of_other_panels(df):
+    plotter = BoxPlotter(df, "kr", categorical="school")
+    plotter.plot()
+    PanelEvent = namedtuple("event", ["xdata", "ydata", "inaxes"])
+    other = plotter.fig.add_subplot(2, 1, 2)
+    assert plotter(PanelEvent(30799, 1, other)) is None
+    assert plotter(PanelEvent(30799, 1, plotter.ax)) is not None
+
+
+def test_stats_renderer_table_percentiles(df):
+    plotter = BoxPlotter(
+        df, "kr", categorical="school", percentiles=(0.05, 0.5)
+    )
+    plotter.plot(box_renderer="stats")
+    table = plotter.table()
+    assert list(table.columns) == [
+        "count", "mean", "std", "min", "5%", "50%", "max"
+    ]
+    assert len(plotter._tables) == 1
+    drawn = plotter.table((0.1, 0.9, 0.05))
+    pdt.assert_series_equal(drawn["5%"], table["5%"])
@@ -0,0 +1,79 @@
+import os
+from unittest import mock
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from catplot.cache import DataCache
+
+
+@pytest.fixture
+def source(tmp_path, df):
+    path = tmp_path / 'export.csv'
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DataCache(tmp_path / 'cache')
+
+
+def count_reads(reader):
+    def counted(path):
+        counted.calls += 1
+        return reader(path)
+    counted.calls = 0
+    return counted
+
+
+def test_hit(cache, source, df):
+    reader = count_reads(pd.read_csv)
+    cache.load(source, reader)
+    pdt.assert_frame_equal(cache.load(source, reader), df)
+    assert reader.calls == 1
+
+
+def test_refresh(cache, source):
+    reader = count_reads(pd.read_csv)
+    cache.load(source, reader)
+    cache.load(source, reader, refresh=True)
+    assert reader.calls == 2
+
+
+def test_modified_source(cache, source, df):
+    reader = count_reads(pd.read_csv)
+    cache.load(source, reader)
+    df.iloc[:3].to_csv(source, index=False)
+    assert len(cache.load(source, reader)) == 3
+    assert reader.calls == 2
+
+
+def test_tag(cache, source):
+    assert cache.key(source) != cache.key(source, tag='corrected')
+
+
+def test_evict(tmp_path, source, df):
+    cache = DataCache(tmp_path / 'cache', max_bytes=1)
+    cache.load(source, pd.read_csv)
+    assert os.listdir(tmp_path / 'cache') == []
+
+
+def test_feather_failure(cache, source):
+    mixed = pd.DataFrame({'id': [1, 'A2', 3.5]})
+    with mock.patch('catplot.cache.has_feather', return_value=True), \
+            mock.patch.object(
+                pd.DataFrame, 'to_feather', side_effect=TypeError('mixed')
+            ):
+        cache.load(source, lambda path: mixed)
+    entries = list(cache.directory.iterdir())
+    assert [e.suffix for e in entries] == ['.pkl']
+    pdt.assert_frame_equal(cache.load(source, pd.read_csv), mixed)
+
+
+def test_write_failure(tmp_path, source, df):
+    blocked = tmp_path / 'file'
+    blocked.write_text('')
+    cache = DataCache(blocked / 'cache')
+    pdt.assert_frame_equal(cache.load(source, pd.read_csv), df)
@@ -0,0 +1,75 @@
+import pandas as pd
+import pandas.testing as pdt
+
+from catplot.coordinates import (
+    categorize, category_codes, coordinates, level_shift, sorted_labels,
+)
+
+
+def test_codes():
+    assert category_codes(['B', 'A', 'C'], ['A', 'B', 'C']).tolist() == [
+        1, 0, 2
+    ]
+
+
+def test_codes_missing():
+    assert category_codes(['B', None, 'D'], ['A', 'B']).tolist() == [
+        1, -1, -1
+    ]
+
+
+def test_codes_single_label():
+    assert category_codes(['A', 'B'], 'A').tolist() == [0, -1]
+
+
+def test_level_shift():
+    assert level_shift(['F', 'M', 'F']).tolist() == [-0.2, 0.2, -0.2]
+
+
+def test_coordinates_no_categorical(df):
+    pdt.assert_series_equal(
+        coordinates(df, None),
+        pd.Series([0.0] * 11, index=df.index)
+    )
+
+
+def test_coordinates_hue(df):
+    calculated = coordinates(df, 'school', hue='km')
+    expected = pd.Series(
+        [1 - 0.8/3, 1 - 0.8/3, 1 - 0.8/3, 0, 1 - 0.8/3, 3 + 0.8/3,
+         0, 0, 1 - 0.8/3, 2 - 0.8/3, 0],
+        index=df.index,
+    )
+    pdt.assert_series_equal(calculated, expected)
+
+
+def test_categorize():
+    values = categorize(pd.Series(['b', 'a', None, 'b']))
+    assert list(values.cat.categories) == ['a', 'b']
+    assert values.cat.codes.tolist() == [1, 0, -1, 1]
+
+
+def test_categorize_strings():
+    values = categorize(pd.Series([21, 20, 21]))
+    assert list(values.cat.categories) == ['20', '21']
+    mixed = categorize(pd.Series([1, '1', 'b'], dtype=object))
+    assert mixed.tolist() == ['1', '1', 'b']
+
+
+def test_categorize_order():
+    values = categorize(pd.Series(['b', 'a', 'c']))
+    ordered = categorize(values, ['c', 'b'])
+    assert list(ordered.cat.categories) == ['c', 'b']
+    assert ordered.cat.codes.tolist() == [1, -1, 0]
+    pdt.assert_series_equal(categorize(ordered, ['c', 'b']), ordered)
+
+
+def test_sorted_labels_observed():
+    values = categorize(pd.Series(['b', 'a', 'c']))
+    assert sorted_labels(values[values != 'a']) == ['b', 'c']
+
+
+def test_codes_categorical():
+    values = categorize(pd.Series(['b', 'a', None]))
+    assert category_codes(values, ['a', 'b']).tolist() == [1, 0, -1]
+    assert category_codes(values, ['b']).tolist() == [0, -1, -1]
@@ -1,5 +1,6 @@
 import pytest
 from collections import namedtuple
+import numpy as np
 import pandas as pd
 import pandas.testing as pdt
 
@@ -78,3 +79,79 @@ def test_filter_keys(test_input, expected):
     ids=["=", ">", "()", "G", "@"])
 def test_filter_dict(test_input, expected):
     assert util.filter_dict(test_input) == expected
+
+
+def test_compile_filters():
+    assert util.compile_filters(("kr>0", "school@C:D")) == (
+        util.Term("kr", ">", 0, "0"),
+        util.Term("school", "@", ("C", "D"), "C:D"),
+    )
+
+
+def test_compile_filters_cached():
+    filters = ("kr>0", "school=B")
+    assert util.compile_filters(filters) is util.compile_filters(filters)
+
+
+def test_filter_mask(df):
+    mask = util.filter_mask(df, ["kr>0", "km=F", "school!=C"])
+    assert mask.tolist() == [
+        True, True, True, False, True, False, False, False, True, False,
+        False
+    ]
+
+
+def test_no_filters(df):
+    assert util.process_filters(df, []) is df
+
+
+@pytest.mark.parametrize('term', [
+    'school=B', 'school!=B', 'school@A:C', 'school.match.[AB]',
+    'age>21', 'age<23', 'age<=22', 'school>A',
+])
+def test_categorical_mask(term):
+    from catplot.coordinates import categorize
+
+    df = pd.DataFrame({
+        'school': ['B', 'A', None, 'C', 'B'],
+        'age': [20, 21, 22, 23, 24],
+    })
+    expected = util.filter_mask(df.astype({'school': object}), [term])
+    categorical = df.assign(
+        school=categorize(df.school), age=categorize(df.age)
+    )
+    if term.startswith('school'):
+        df = categorical[['school']].join(df.age)
+    else:
+        df = categorical[['age']].join(df.school)
+    assert util.filter_mask(df, [term]).tolist() == expected.tolist()
+
+
+def test_compact():
+    df = pd.DataFrame({
+        'n': [1, 2, 300],
+        'x': [0.5, 1.25, float('nan')],
+        'y': [0.1, 0.2, 0.3],
+        's': ['a', 'a', 'a'],
+        'u': ['a', 'b', 'c'],
+    })
+    compacted = util.compact(df)
+    assert compacted.n.dtype == 'int16'
+    assert compacted.x.dtype == 'float32'
+    assert compacted.y.dtype == 'float64'
+    assert compacted.s.dtype == 'category'
+    assert compacted.u.dtype == object
+    pdt.assert_frame_equal(compacted, df, check_dtype=False,
+                           check_categorical=False)
+    assert df.n.dtype == 'int64'
+    assert np.shares_memory(compacted.y.to_numpy(), df.y.to_numpy())
+
+
+def test_compact_filters(df):
+    compacted = util.compact(df)
+    for filters in (['kr<=29845'], ['school=B'], ['km!=F'], ['kr>30000']):
+        pdt.assert_frame_equal(
+            util.process_filters(compacted, filters),
+            util.process_filters(df, filters),
+            check_dtype=False, check_categorical=False,
+        )
@@ -0,0 +1,49 @@
+from collections import namedtuple
+
+import pandas.testing as pdt
+
+from catplot.hittest import HitIndex
+from catplot.plotters import BoxPlotter, PointPlotter
+
+Event = namedtuple("event", ["xdata", "ydata"])
+
+
+def test_query_nearest():
+    index = HitIndex([1.0, 2.0, 3.0], [0, 0, 1], 0.6, 0.5)
+    assert index.query(1.9, 0.1) == 1
+
+
+def test_query_outside_tolerance():
+    index = HitIndex([1.0, 2.0, 3.0], [0, 0, 1], 0.6, 0.5)
+    assert index.query(2.0, 0.6) is None
+
+
+def test_query_other_lane():
+    index = HitIndex([1.0, 2.0, 3.0], [0, 0, 1], 0.6, 0.5)
+    assert index.query(2.9, 0.9) == 2
+
+
+def test_zero_tolerance():
+    index = HitIndex([1.0, 1.0], [0, 0], 0, 0.01)
+    assert index.query(1.0, 0) is None
+
+
+def test_index_reused(active):
+    plotter = BoxPlotter(active, "kr", categorical="school")
+    index = plotter.hit_index()
+    plotter.get_row(Event(30799, 1))
+    assert plotter.hit_index() is index
+
+
+def test_index_rebuilt_on_new_data(active):
+    plotter = BoxPlotter(active, "kr", categorical="school")
+    index = plotter.hit_index()
+    plotter.df = plotter.df.iloc[:5]
+    assert plotter.hit_index() is not index
+
+
+def test_point_get_row(active):
+    plotter = PointPlotter(active, "kr", categorical="km")
+    plotter.sorted = active.sort_values("kr").reset_index(drop=True)
+    row = plotter.get_row(Event(3.2, 30799))
+    pdt.assert_series_equal(row, plotter.sorted.iloc[3])
@@ -0,0 +1,241 @@
+from unittest import mock
+
+import pandas.testing as pdt
+import pytest
+
+from catplot import main
+
+
+@pytest.fixture
+def export(workdir):
+    return 'export.csv'
+
+
+def test_needed_columns():
+    cfg = {
+        'num': 'kr', 'cat': 'school', 'annotate': ['name'],
+        'filters': ['km=F', 'age>20'],
+    }
+    assert main.needed_columns([cfg]) == {'kr', 'school', 'name', 'km', 'age'}
+
+
+def test_needed_columns_show():
+    assert main.needed_columns([{'num': 'kr', 'show': ['km=F']}]) is None
+
+
+def test_projection(export):
+    cfg = {'data': export, 'num': 'kr', 'cat': 'school', 'no_cache': True}
+    df = main.load_data(cfg)
+    assert list(df.columns) == ['kr', 'school']
+
+
+def test_stream_filters(export, df):
+    cfg = {
+        'data': export, 'num': 'kr', 'filters': ['school=B'],
+        'chunksize': 3, 'no_compact': True,
+    }
+    calculated = main.load_data(cfg)
+    expected = df.loc[df.school == 'B', ['kr', 'school']]
+    pdt.assert_frame_equal(calculated, expected)
+
+
+def test_stream_corrections(export, tmp_path, df):
+    (tmp_path / 'korr.csv').write_text('index,column,value\n9,school,B\n')
+    cfg = {
+        'data': export, 'num': 'kr', 'filters': ['school=B'],
+        'chunksize': 4,
+    }
+    calculated = main.load_data(cfg)
+    assert list(calculated.index) == [0, 1, 2, 4, 8, 9]
+
+
+def test_corrections_keep_dtype(export, tmp_path):
+    (tmp_path / 'korr.csv').write_text(
+        'index,column,value\n0,kr,25000\n1,kr,26000\n2,school,C\n0,kr,25500\n'
+    )
+    cfg = {'data': export, 'num': 'kr', 'cat': 'school', 'no_cache': True}
+    df = main.load_data(cfg)
+    assert df.kr.dtype.kind == 'i'
+    assert list(df.kr[:2]) == [25500, 26000]
+    assert df.school[2] == 'C'
+
+
+def test_corrections_coerce():
+    import pandas as pd
+    from catplot.corrections import Corrections
+
+    df = pd.DataFrame({'kr': [1, 2, 3], 'x': [0.5, 1.5, 2.5]})
+    edits = {
+        'kr': pd.Series(['1.5'], index=[7]),
+        'x': pd.Series(['4'], index=[1]),
+        'y': pd.Series(['4'], index=[1]),
+    }
+    Corrections(edits).apply(df)
+    assert df.kr.dtype == 'int64'
+    assert df.x.tolist() == [0.5, 4.0, 2.5]
+
+    Corrections({'kr': pd.Series(['1.5'], index=[0])}).apply(df)
+    assert df.kr.tolist() == [1.5, 2, 3]
+    Corrections({'kr': pd.Series(['n/a'], index=[1])}).apply(df)
+    assert df.kr.tolist() == [1.5, 'n/a', 3]
+
+
+def test_corrections_cached(export, tmp_path):
+    korr = tmp_path / 'korr.csv'
+    korr.write_text('index,column,value\n0,kr,1\n')
+    cfg = {'data': export, 'num': 'kr', 'cache_dir': str(tmp_path / 'cache')}
+    assert main.load_data(cfg).kr[0] == 1
+    assert main.load_data(cfg).kr[0] == 1
+    korr.write_text('index,column,value\n0,kr,2\n')
+    with mock.patch('catplot.main.read_data') as read_data:
+        assert main.load_data(cfg).kr[0] == 2
+    read_data.assert_not_called()
+    assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+
+def test_load_categorizes(export):
+    cfg = {
+        'data': export, 'num': 'kr', 'cat': 'school', 'hue': 'km',
+        'no_cache': True,
+    }
+    df = main.load_data(cfg)
+    assert df.school.dtype == 'category'
+    assert list(df.km.cat.categories) == ['F', 'M', 'O']
+    assert df.kr.dtype.kind == 'i'
+
+
+def test_load_compacts(export, df):
+    cfg = {'data': export, 'num': 'kr', 'cat': 'school', 'no_cache': True}
+    compacted = main.load_data(cfg)
+    assert compacted.kr.dtype == 'int32'
+    assert list(compacted.kr) == list(df.kr)
+
+
+def test_load_no_compact(export):
+    cfg = {
+        'data': export, 'num': 'kr', 'no_cache': True, 'no_compact': True,
+    }
+    assert main.load_data(cfg).kr.dtype == 'int64'
+
+
+def test_memory_report(export, capsys):
+    cfg = {
+        'data': export, 'num': 'kr', 'no_cache': True, 'memory_report': True,
+    }
+    main.load_data(cfg)
+    report = capsys.readouterr().err
+    assert 'before' in report and 'after' in report
+    assert 'total' in report
+
+
+@pytest.fixture
+def snapshots(tmp_path, monkeypatch, df):
+    monkeypatch.chdir(tmp_path)
+    df.iloc[:6].to_csv(tmp_path / '2024-01.csv', index=False)
+    df.iloc[6:].to_csv(tmp_path / '2024-02.csv', index=False)
+    return '20*.csv'
+
+
+def test_data_files(snapshots):
+    assert main.data_files(snapshots) == ['2024-01.csv', '2024-02.csv']
+    assert main.data_files('2024-02.csv,\n2024-01.csv') == [
+        '2024-02.csv', '2024-01.csv'
+    ]
+    assert main.has_snapshots(snapshots)
+    assert not main.has_snapshots('2024-01.csv')
+
+
+def test_load_snapshots(snapshots, df):
+    cfg = {
+        'data': snapshots, 'num': 'kr', 'cat': 'snapshot', 'no_cache': True,
+    }
+    loaded = main.load_data(cfg)
+    assert list(loaded.index) == list(range(len(df)))
+    assert loaded.kr.tolist() == df.kr.tolist()
+    assert loaded.snapshot.tolist() == 6 * ['2024-01'] + 5 * ['2024-02']
+
+
+@pytest.mark.parametrize('chunksize', [None, 2])
+def test_snapshot_filters(snapshots, df, chunksize):
+    cfg = {
+        'data': snapshots, 'num': 'kr', 'filters': ['snapshot=2024-02'],
+        'no_cache': True, 'chunksize': chunksize,
+    }
+    loaded = main.process_filters(main.load_data(cfg), cfg['filters'])
+    assert list(loaded.index) == list(range(6, 11))
+    assert loaded.kr.tolist() == df.kr[6:].tolist()
+
+
+def test_snapshot_corrections(snapshots, tmp_path):
+    (tmp_path / 'korr.csv').write_text('index,column,value\n7,kr,1\n')
+    cfg = {'data': snapshots, 'num': 'kr', 'no_cache': True}
+    loaded = main.load_data(cfg)
+    assert loaded.kr[7] == 1
+    assert (loaded.kr == 1).sum() == 1
+
+
+@pytest.mark.parametrize('chunksize', [None, 2])
+def test_snapshot_keyed_corrections(snapshots, tmp_path, df, chunksize):
+    (tmp_path / 'korr.csv').write_text(
+        'snapshot,index,column,value\n2024-02,1,kr,1\n2024-02,5,kr,2\n'
+    )
+    cfg = {
+        'data': snapshots, 'num': 'kr', 'no_cache': True,
+        'chunksize': chunksize,
+    }
+    loaded = main.load_data(cfg)
+    assert loaded.kr[7] == 1
+    assert (loaded.kr == 1).sum() == 1
+    assert (loaded.kr == 2).sum() == 0
+    # an earlier file moves the rows, not the edit
+    df.iloc[:3].to_csv(tmp_path / '2023-12.csv', index=False)
+    loaded = main.load_data(cfg)
+    assert loaded.kr[10] == 1
+    assert loaded.snapshot[10] == '2024-02'
+    assert (loaded.kr == 1).sum() == 1
+
+
+def test_read_snapshot_corrections(tmp_path):
+    from catplot.corrections import Corrections
+
+    korr = tmp_path / 'korr.csv'
+    korr.write_text(
+        'snapshot,index,column,value\n'
+        '2024-02,1,kr,1\n,1,kr,2\n2024-02,1,kr,3\n'
+    )
+    corrections = Corrections.read(korr)
+    assert len(corrections) == 2
+    assert corrections.edits['kr'].to_dict() == {1: '2'}
+    assert corrections.snapshot('2024-02').edits['kr'].to_dict() == {1: '3'}
+    assert corrections.snapshot('2024-01') is None
+
+
+def test_snapshots_cached_per_file(snapshots, tmp_path, df):
+    cfg = {
+        'data': snapshots, 'num': 'kr', 'cache_dir': str(tmp_path / 'cache'),
+    }
+    main.load_data(cfg)
+    assert len(list((tmp_path / 'cache').iterdir())) == 2
+    df.iloc[:2].to_csv(tmp_path / '2024-03.csv', index=False)
+    with mock.patch('catplot.main.read_data', wraps=main.read_data) as read:
+        loaded = main.load_data(cfg)
+    read.assert_called_once()
+    assert read.call_args.args[0] == '2024-03.csv'
+    assert loaded.snapshot.cat.categories.tolist() == [
+        '2024-01', '2024-02', '2024-03'
+    ]
+
+
+def test_snapshots_over_cache_limit(tmp_path, monkeypatch, df):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'd').mkdir()
+    for month in range(40):
+        df.to_csv(tmp_path / 'd' / f'{month:02d}.csv', index=False)
+    cfg = {
+        'data': 'd/*.csv', 'num': 'kr',
+        'cache_dir': str(tmp_path / 'cache'), 'cache_size': 0.005,
+    }
+    for _ in range(3):
+        assert len(main.load_data(cfg)) == 40 * len(df)
+    size = sum(e.stat().st_size for e in (tmp_path / 'cache').iterdir())
+    assert size <= 0.005 * 1024 ** 2
@@ -0,0 +1,75 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from catplot import output, stats
+
+
+def test_atomic_replaces(tmp_path):
+    path = tmp_path / 'tab.csv'
+    path.write_text('old')
+    with output.atomic(path) as tmp:
+        assert tmp.suffix == '.csv'
+        tmp.write_text('new')
+    assert path.read_text() == 'new'
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_failure_keeps_old(tmp_path):
+    path = tmp_path / 'tab.csv'
+    path.write_text('old')
+    with pytest.raises(RuntimeError):
+        with output.atomic(path) as tmp:
+            tmp.write_text('partial')
+            raise RuntimeError
+    assert path.read_text() == 'old'
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_nothing_written(tmp_path):
+    with output.atomic(tmp_path / 'fig.png'):
+        pass
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('format, name', [
+    (None, 'myfig.png'), ('svg', 'myfig.svg')
+])
+def test_write_figure_no_extension(tmp_path, format, name):
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure()
+    kwargs = {'format': format} if format else {}
+    path = output.write_figure(fig, tmp_path / 'myfig', **kwargs)
+    plt.close(fig)
+    assert path == tmp_path / name
+    assert [p.name for p in tmp_path.iterdir()] == [name]
+
+
+@pytest.mark.parametrize('hue', [None, 'km'])
+def test_stream_excel(tmp_path, df, hue):
+    table = stats.table(df, 'kr', 'school', hue=hue)
+    output.write_excel(table, tmp_path / 'a.xlsx')
+    output.write_excel(table, tmp_path / 'b.xlsx', stream_rows=0)
+    pdt.assert_frame_equal(
+        pd.read_excel(tmp_path / 'a.xlsx'), pd.read_excel(tmp_path / 'b.xlsx')
+    )
+
+
+def test_writer(tmp_path, df):
+    table = stats.table(df, 'kr', 'school')
+    with output.Writer() as writer:
+        writer.submit(output.write_csv, table, tmp_path / 'tab.csv')
+        writer.submit(output.write_excel, table, tmp_path / 'tab.xlsx')
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'tab.csv', 'tab.xlsx'
+    ]
+
+
+def test_writer_raises():
+    def fail():
+        raise ValueError('disk full')
+
+    with pytest.raises(ValueError, match='disk full'):
+        with output.Writer() as writer:
+            writer.submit(fail)
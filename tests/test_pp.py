@@ -42,3 +42,73 @@ def test_read_xl_data():
     with mock.patch("catplot.main.pd.read_excel") as mock_xl:
         main.process_data("exported.xlsx")
         mock_xl.assert_called
+
+
+def test_read_xl_columns():
+    with mock.patch("catplot.main.pd.read_excel") as mock_xl:
+        main.process_data("exported.xlsx", columns={"kr"})
+        usecols = mock_xl.call_args.kwargs["usecols"]
+        assert usecols("kr")
+        assert not usecols("km")
+
+
+def large_frame(n=20000):
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "kr": rng.normal(30000, 5000, n).round(),
+        "km": rng.choice(["K", "M"], n),
+        "id": range(n),
+    })
+
+
+def test_pp_thinned_plot():
+    df = large_frame()
+    pp = plotters.PointPlotter(df, numerical="kr", categorical="km")
+
+    with mock.patch("catplot.plotters.sns.stripplot") as mock_stripplot:
+        pp.plot(max_points=1000, show=["id=17"])
+
+    mock_stripplot.assert_not_called()
+    drawn = sum(len(layer.get_offsets()) for layer in pp.layers)
+    assert drawn <= 1100
+    positions = pp.thin(0, len(df))
+    assert {0, len(df) - 1} <= set(positions)
+    assert pp.sorted.index[pp.sorted.id == 17][0] in positions
+
+
+def test_pp_thinned_keeps_bucket_extremes():
+    df = large_frame()
+    pp = plotters.PointPlotter(df, numerical="kr", categorical="km")
+    pp.plot(max_points=100)
+
+    positions = pp.thin(0, len(df))
+    values = pp.sorted.kr.to_numpy()
+    for code in (0, 1):
+        in_category = pp.codes == code
+        kept = positions[pp.codes[positions] == code]
+        assert values[kept].min() == values[in_category].min()
+        assert values[kept].max() == values[in_category].max()
+
+
+def test_pp_thinned_zoom_adds_detail():
+    df = large_frame()
+    pp = plotters.PointPlotter(df, numerical="kr", categorical="km")
+    pp.plot(max_points=1000)
+
+    pp.ax.set_xlim(100, 600)
+    offsets = [layer.get_offsets() for layer in pp.layers]
+    xs = sorted(x for o in offsets for x, _ in o)
+    assert xs[0] >= 100 and xs[-1] <= 601
+    assert len(xs) == 501
+
+
+def test_pp_thinned_hover_finds_rows():
+    df = large_frame()
+    pp = plotters.PointPlotter(df, numerical="kr", categorical="km")
+    pp.plot(max_points=1000)
+
+    row = pp.sorted.iloc[1234]
+    assert pp.hit_row(1234, row.kr).id == row.id
@@ -0,0 +1,49 @@
+import json
+import sys
+
+from catplot import main, profile
+
+
+def test_stage_inactive():
+    with profile.stage('idle') as record:
+        record['rows'] = 1
+    assert 'wall' not in record
+
+
+def test_collect_nested():
+    with profile.collect() as collected:
+        with profile.stage('plot', rows=3):
+            with profile.stage('draw') as record:
+                record['rows'] = 2
+    stages = {r['stage']: r for r in collected.records}
+    assert set(stages) == {'plot', 'plot/draw'}
+    assert stages['plot/draw']['rows'] == 2
+    assert stages['plot']['wall'] >= stages['plot/draw']['wall']
+    assert '  draw' in collected.summary()
+
+
+def test_listener():
+    records = []
+    profile.add_listener(records.append)
+    try:
+        with profile.stage('load', rows=5):
+            pass
+    finally:
+        profile.remove_listener(records.append)
+    assert [(r['stage'], r['rows']) for r in records] == [('load', 5)]
+
+
+def test_table_only_profile(workdir, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', [
+        'catplot', '--data', 'export.csv', '--num', 'kr', '--cat', 'school',
+        '--table-only', '--no-cache', '--filters', 'km=F',
+        '--profile', 'json', '--profile-output', 'profile.json',
+        '--cprofile', 'run.prof',
+    ])
+    main.main()
+    records = json.loads((workdir / 'profile.json').read_text())
+    rows = {r['stage']: r['rows'] for r in records}
+    assert rows['load'] == 11
+    assert rows['filter'] == 6
+    assert rows['write_excel'] == 3
+    assert (workdir / 'run.prof').exists()
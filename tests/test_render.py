@@ -0,0 +1,182 @@
+import collections
+import os
+import pathlib
+import subprocess
+import sys
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+
+from catplot import main, plotters
+
+ROOT = pathlib.Path(__file__).parents[1]
+
+
+def test_output_files_format():
+    cfg = {'plot_type': 'box', 'num': 'kr', 'format': 'svg'}
+    assert main.output_files(cfg) == ('box-kr.svg', 'tab-kr.csv')
+
+
+def test_figure_size():
+    assert main.figure_size('16x9') == (16.0, 9.0)
+    assert main.figure_size('4.5, 3') == (4.5, 3.0)
+
+
+def test_savefig_options():
+    assert main.savefig_options({'format': 'svg', 'dpi': '150'}) == {
+        'format': 'svg', 'dpi': 150.0
+    }
+    assert main.savefig_options({}) == {}
+
+
+def test_render_savefig_no_extension(workdir, df):
+    cfg = {'plot_type': 'box', 'num': 'kr', 'savefig': 'myfig'}
+    main.render(df, cfg)
+    plt.close('all')
+    assert (workdir / 'myfig.png').exists()
+    assert not [p for p in workdir.iterdir() if p.name.startswith('.')]
+
+
+def motion_callbacks(df, **kwargs):
+    plotter = plotters.BoxPlotter(df, 'kr', categorical='school', **kwargs)
+    plotter.plot()
+    callbacks = plotter.fig.canvas.callbacks.callbacks
+    return plotter, len(callbacks.get('motion_notify_event', {}))
+
+
+def test_not_interactive(df):
+    plotter, passive = motion_callbacks(df, interactive=False)
+    _, interactive = motion_callbacks(df)
+    assert interactive == passive + 1
+    assert plotter.tooltip is None
+
+
+def test_agg_when_not_displayed(workdir):
+    script = (
+        "import sys;"
+        "from catplot.main import main;"
+        "main();"
+        "import matplotlib;"
+        "assert matplotlib.get_backend().lower() == 'agg';"
+        "assert not any(m.startswith('PyQt') for m in sys.modules)"
+    )
+    env = {**os.environ, 'PYTHONPATH': str(ROOT)}
+    env.pop('MPLBACKEND', None)
+    subprocess.run(
+        [
+            sys.executable, '-c', script,
+            '--data', 'export.csv', '--num', 'kr', '--cat', 'school',
+            '--plot-type', 'box', '--no-cache', '--format', 'svg',
+            '--dpi', '50', '--size', '4x3',
+        ],
+        cwd=workdir, check=True, env=env, stdout=subprocess.DEVNULL,
+    )
+    svg = (workdir / 'box-kr-school.svg').read_text()
+    assert 'width="288pt"' in svg
+
+
+def test_numericals():
+    assert main.numericals('kr') == ['kr']
+    assert main.numericals(['total', 'kr'], ['total kr']) == ['total kr']
+    assert main.numericals(['kr', 'age'], ['kr', 'age']) == ['kr', 'age']
+
+
+def test_table_only_facet(workdir, df):
+    cfg = {'plot_type': 'box', 'num': 'kr', 'cat': 'km', 'facet': 'school'}
+    assert main.render_table(df, cfg) == 'tab-kr-km.csv'
+    assert (workdir / 'tab-kr-km.csv').exists()
+
+
+def test_output_files_metrics():
+    cfg = {'plot_type': 'box', 'num': ['kr', 'age'], 'cat': 'km'}
+    assert main.output_files(cfg) == ('box-kr+age-km.png', 'tab-kr+age-km.csv')
+
+
+@pytest.mark.parametrize('plot_type', ['box', 'strip', 'point'])
+def test_render_metrics(workdir, df, plot_type):
+    df = df.assign(bonus=df.kr // 10)
+    cfg = {'plot_type': plot_type, 'num': ['kr', 'bonus'], 'cat': 'school'}
+    figure_file, csv_file = main.render(df, cfg)
+    assert (figure_file, csv_file) == (
+        f'{plot_type}-kr+bonus-school.png', 'tab-kr+bonus-school.csv'
+    )
+    assert len(plt.gcf().axes) == 2
+    table = pd.read_csv(workdir / csv_file, header=[0, 1], index_col=0)
+    assert list(table.columns.levels[0]) == ['bonus', 'kr']
+    assert (workdir / 'tab-kr+bonus-school.xlsx').exists()
+    plt.close('all')
+
+
+def test_split_facets(df):
+    facets = main.split_facets(df, 'school', ['C', 'A', 'X'])
+    assert [value for value, _ in facets] == ['C', 'A']
+    assert facets[0][1].index.tolist() == [9]
+    assert facets[1][1].index.tolist() == [3, 6, 7, 10]
+
+
+@pytest.mark.parametrize('plot_type', ['box', 'strip', 'point'])
+def test_render_facets(workdir, monkeypatch, df, plot_type):
+    cfg = {
+        'plot_type': plot_type, 'num': 'kr', 'cat': 'km', 'facet': 'school',
+        'display': True,
+    }
+    monkeypatch.setattr(plt, 'show', lambda: None)
+    figure_file, csv_file = main.render(df, cfg)
+    assert figure_file == f'{plot_type}-kr-km-per-school.png'
+    assert csv_file == 'tab-kr-km.csv'
+    axes = plt.gcf().axes
+    assert [ax.get_title() for ax in axes] == [
+        'school=A', 'school=B', 'school=C', 'school=D'
+    ]
+    assert (workdir / figure_file).exists()
+    plt.close('all')
+
+
+def test_facet_hit_test(df):
+    cfg = {'plot_type': 'box', 'num': 'kr', 'cat': 'km', 'facet': 'school'}
+    plotter = plotters.BoxPlotter(df, 'kr', categorical='km', cfg=cfg)
+    panels = main.plot_facets(plotter, {**cfg, 'title': ''})
+    assert [panel.categorical_values() for panel in panels] == 4 * [
+        ['F', 'M', 'O']
+    ]
+    Event = collections.namedtuple('event', ['xdata', 'ydata', 'inaxes'])
+    a, b = panels[:2]
+    row = a.get_row(Event(39648, 1, a.ax))
+    assert row.school == 'A' and row.kr == 39648
+    assert b(Event(39648, 1, a.ax)) is None
+    assert b.get_row(Event(22732, 0, b.ax)).name == 0
+    plt.close('all')
+
+
+@pytest.mark.parametrize('filters', [['kr>100000'], ['school=X']])
+def test_render_no_facets(workdir, df, filters):
+    cfg = {
+        'plot_type': 'box', 'num': 'kr', 'cat': 'km', 'facet': 'school',
+        'filters': filters,
+    }
+    figure_file, _ = main.render(df, cfg)
+    assert (workdir / figure_file).exists()
+    assert len(plt.gcf().axes) == 1
+    assert main.panels('box', 0, grid=True) == []
+    plt.close('all')
+
+
+def test_facets_skip_frame_coordinates(df):
+    cfg = {'plot_type': 'box', 'num': 'kr', 'cat': 'km', 'facet': 'school'}
+    plotter = plotters.BoxPlotter(
+        df, 'kr', categorical='km', interactive=True, cfg=cfg
+    )
+    main.plot_facets(plotter, {**cfg, 'title': ''})
+    assert plotter._coordinates is None
+    plt.close('all')
+
+
+def test_saved_plot_skips_coordinates(df):
+    plotter = plotters.BoxPlotter(
+        df, 'kr', categorical='school', interactive=False
+    )
+    plotter.plot()
+    assert plotter._coordinates is None
+    assert len(plotter.y) == len(df)
+    plt.close('all')
@@ -0,0 +1,182 @@
+import json
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from catplot import main, server
+
+
+@pytest.fixture
+def app(df):
+    return server.App(df, {'annotate': ['km']}, entries=4)
+
+
+@pytest.fixture
+def url(app):
+    httpd = server.make_server(app, quiet=True)
+    thread = threading.Thread(
+        target=httpd.serve_forever, args=(0.01,), daemon=True
+    )
+    thread.start()
+    host, port = httpd.server_address[:2]
+    yield f'http://{host}:{port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(url, path, **params):
+    query = urllib.parse.urlencode(params, doseq=True)
+    with urllib.request.urlopen(f'{url}{path}?{query}') as response:
+        return response.headers['Content-Type'], response.read()
+
+
+def test_parse_spec():
+    assert server.parse_spec('num=kr&filters=km=F&filters=kr>0') == {
+        'num': 'kr', 'filters': ['km=F', 'kr>0']
+    }
+
+
+def test_lru():
+    cache = server.LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert len(cache) == 2
+
+
+def test_health(url):
+    assert get(url, '/health') == ('text/plain', b'ok')
+
+
+def test_plot_png(url):
+    content_type, body = get(
+        url, '/plot', num='kr', cat='school', hue='km', filters=['kr>0']
+    )
+    assert content_type == 'image/png'
+    assert body.startswith(b'\x89PNG')
+
+
+def test_plot_svg(url):
+    content_type, body = get(
+        url, '/plot', num='kr', cat='school', format='svg',
+        plot_type='strip',
+    )
+    assert content_type == 'image/svg+xml'
+    assert b'<svg' in body
+
+
+def test_table_json(url, df):
+    content_type, body = get(
+        url, '/table', num='kr', cat='school', filters='km=F', format='json'
+    )
+    assert content_type == 'application/json'
+    table = json.loads(body)
+    assert table['index'] == ['B', 'C', 'Alla']
+    assert table['data'][-1][0] == (df.km == 'F').sum()
+
+
+def test_table_csv(url):
+    content_type, body = get(url, '/table', num='kr')
+    assert content_type == 'text/csv'
+    assert body.decode().splitlines()[0].startswith('alla,count,mean')
+
+
+@pytest.mark.parametrize('params', [
+    {'num': 'salary'},
+    {'num': 'kr', 'filters': 'salary>0'},
+    {'num': 'kr', 'format': 'gif'},
+    {'cat': 'school'},
+    {'num': 'kr', 'approximate': '1', 'save_sketches': 'sketch.json'},
+    {'num': 'kr', 'approximate': '1', 'merge_sketches': 'sketch.json'},
+    {'num': 'kr', 'savefig': 'plot.png'},
+])
+def test_bad_request(url, params):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(url, '/plot', **params)
+    assert error.value.code == 400
+    assert 'error' in json.loads(error.value.read())
+
+
+@pytest.mark.parametrize('cfg, spec', [
+    ({'num': ['kr', 'salary']}, {}),
+    ({'num': ['kr', 'salary'], 'cat': 'school'}, {}),
+    ({'cat': ['school', 'year']}, {'num': 'kr'}),
+])
+def test_unknown_cli_columns(df, cfg, spec):
+    app = server.App(df, cfg)
+    with pytest.raises(server.BadRequest, match='Unknown column'):
+        app.settings(spec)
+
+
+def test_multi_numerical_table(df):
+    app = server.App(df.assign(kr2=df.kr * 2), {'num': ['kr', 'kr2']})
+    content_type, _ = app.table({})
+    assert content_type == 'text/csv'
+    with pytest.raises(server.BadRequest):
+        app.plot({})
+
+
+def test_cli_format(df):
+    app = server.App(df, {'num': 'kr', 'format': 'svg'})
+    content_type, body = app.plot({})
+    assert content_type == 'image/svg+xml'
+    assert b'<svg' in body
+    content_type, _ = app.plot({'format': 'png'})
+    assert content_type == 'image/png'
+
+
+def test_serve_without_num(monkeypatch):
+    serve = mock.Mock()
+    monkeypatch.setattr(server, 'serve', serve)
+    main.run({'data': 'export.csv', 'serve': '8050'})
+    serve.assert_called_once()
+
+
+def test_not_found(url):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(url, '/nothing')
+    assert error.value.code == 404
+
+
+def test_results_cached(app):
+    spec = {'num': 'kr', 'cat': 'school'}
+    with mock.patch('catplot.main.compute_table') as compute:
+        compute.return_value = pd.DataFrame({'count': [1]})
+        app.table(spec)
+        app.table(dict(spec))
+    compute.assert_called_once()
+
+
+def test_frames_cached(app):
+    assert app.filtered(['km=F']) is app.filtered(['km=F'])
+    assert app.filtered([]) is app.df
+
+
+def test_concurrent_plots(url, app):
+    def plot(school):
+        return get(
+            url, '/plot', num='kr', cat='km', filters=f'school={school}'
+        )
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(plot, ['A', 'B', 'C', 'A', 'B', 'C']))
+    assert all(body.startswith(b'\x89PNG') for _, body in results)
+    assert results[0] == results[3]
+    assert list(app.df.columns) == ['kr', 'km', 'school']
+
+
+def test_no_files_written(url, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    params = {'num': 'kr', 'approximate': '1', 'format': 'csv'}
+    content_type, _ = get(url, '/table', **params)
+    assert content_type == 'text/csv'
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas.testing as pdt
+import pytest
+
+from catplot import stats
+from catplot.sketch import KLL, Sketches
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).normal(30000, 5000, 100_000)
+
+
+def test_small_exact(active):
+    sketches = Sketches().update(active, "kr", "km")
+    pdt.assert_frame_equal(
+        sketches.describe(), stats.table(active, "kr", "km")
+    )
+    assert sketches.rank_error() == 0
+
+
+def test_rank_error(values):
+    sketch = KLL()
+    sketch.update(values)
+    ranks = np.searchsorted(
+        np.sort(values), sketch.quantiles([0.1, 0.5, 0.9])
+    ) / len(values)
+    assert np.abs(ranks - [0.1, 0.5, 0.9]).max() < sketch.rank_error()
+    assert sum(len(items) for items in sketch.levels) < 1000
+
+
+def test_exact_moments(values):
+    sketch = KLL()
+    for chunk in np.array_split(values, 7):
+        part = KLL()
+        part.update(chunk)
+        sketch.merge(part)
+    assert sketch.count == len(values)
+    assert sketch.mean == pytest.approx(values.mean())
+    assert sketch.describe([])[2] == pytest.approx(values.std(ddof=1))
+    assert sketch.min == values.min()
+
+
+def test_save_merge(tmp_path, active):
+    path = tmp_path / "sketches.json"
+    Sketches().update(active.iloc[:5], "kr", "km", "school").save(path)
+    merged = Sketches.load(path).merge(
+        Sketches().update(active.iloc[5:], "kr", "km", "school")
+    )
+    expected = stats.table(active, "kr", "km", "school")
+    pdt.assert_frame_equal(
+        merged.describe()[["count", "mean", "min", "max"]],
+        expected[["count", "mean", "min", "max"]],
+    )
@@ -0,0 +1,53 @@
+import os
+import pathlib
+import subprocess
+import sys
+from unittest import mock
+
+import pytest
+
+from catplot.lazy import LazyModule
+
+ROOT = pathlib.Path(__file__).parents[1]
+HEAVY = ('pandas', 'numpy', 'matplotlib', 'seaborn')
+
+
+def imported(module):
+    """
+    Heavy modules loaded by importing module in a fresh interpreter
+    """
+    script = (
+        f"import sys, {module};"
+        f"print(' '.join(m for m in {HEAVY} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script], capture_output=True, text=True,
+        check=True, env={**os.environ, 'PYTHONPATH': str(ROOT)},
+    )
+    return result.stdout.split()
+
+
+def test_main_imports():
+    assert imported('catplot.main') == []
+
+
+def test_plotters_imports():
+    assert imported('catplot.plotters') == ['pandas', 'numpy']
+
+
+def test_lazy_module():
+    json = LazyModule('json')
+    assert json.dumps([]) == '[]'
+
+
+def test_lazy_module_missing_attribute():
+    with pytest.raises(AttributeError):
+        LazyModule('json').no_such_function
+
+
+def test_lazy_module_imported_once():
+    json = LazyModule('json')
+    json.dumps([])
+    with mock.patch('importlib.import_module') as import_module:
+        assert json.loads('[]') == []
+    import_module.assert_not_called()
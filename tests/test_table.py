@@ -39,3 +39,49 @@ def test_tabluar_grouped(active):
         index=pd.Index(['F', 'M', 'Alla'])
     )
     pdt.assert_frame_equal(calculated, expected)
+
+
+def test_table_no_mutation(active):
+    columns = list(active.columns)
+    plotters.Plotter(active, "kr", categorical="km").table()
+    assert list(active.columns) == columns
+
+
+def test_tabular_hue(active):
+    plotter = plotters.Plotter(active, "kr", categorical="km", hue="school")
+    calculated = plotter.table()
+    assert list(calculated.index) == [
+        ("F", "B"), ("F", "C"), ("F", "Alla"),
+        ("M", "A"), ("M", "Alla"),
+        "Alla",
+    ]
+    assert calculated["count"].tolist() == [5, 1, 6, 4, 4, 10]
+    assert calculated.loc[[("M", "A")], "max"].item() == 39648
+
+
+def test_tabular_percentiles(active):
+    plotter = plotters.Plotter(active, "kr", percentiles=(0.5, 0.05))
+    calculated = plotter.table()
+    assert list(calculated.columns) == [
+        "count", "mean", "std", "min", "5%", "50%", "max"
+    ]
+    assert calculated.loc["Alla", "50%"] == active.kr.median()
+
+
+def test_table_empty():
+    from catplot import stats
+
+    table = stats.table(pd.DataFrame({'kr': [], 'km': []}), 'kr', 'km')
+    assert list(table.index) == ['Alla']
+    assert table.loc['Alla', 'count'] == 0
+
+
+def test_tabular_metrics(active):
+    active = active.assign(bonus=active.kr // 10)
+    plotter = plotters.Plotter(active, "kr", categorical="km", hue="school")
+    calculated = plotter.table(numerical=["kr", "bonus"])
+    assert list(calculated.columns.levels[0]) == ["kr", "bonus"]
+    pdt.assert_frame_equal(calculated["kr"], plotter.table())
+    assert calculated[("bonus", "max")].tolist() == (
+        calculated[("kr", "max")] // 10
+    ).tolist()
@@ -0,0 +1,27 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).parents[1]
+
+
+def test_table_only(workdir):
+    script = (
+        "import sys;"
+        "from catplot.main import main;"
+        "main();"
+        "assert 'matplotlib' not in sys.modules;"
+        "assert 'seaborn' not in sys.modules"
+    )
+    subprocess.run(
+        [
+            sys.executable, '-c', script,
+            '--data', 'export.csv', '--num', 'kr', '--cat', 'school',
+            '--table-only', '--no-cache',
+        ],
+        cwd=workdir, check=True,
+        env={**os.environ, 'PYTHONPATH': str(ROOT)},
+    )
+    assert (workdir / 'tab-kr-school.csv').exists()
+    assert (workdir / 'tab-kr-school.xlsx').exists()
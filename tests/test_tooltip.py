@@ -0,0 +1,67 @@
+from collections import namedtuple
+from unittest import mock
+
+import matplotlib.pyplot as plt
+import pytest
+
+from catplot.plotters import BoxPlotter
+from catplot.tooltip import Tooltip
+
+Event = namedtuple("event", ["xdata", "ydata"])
+
+
+@pytest.fixture
+def tooltip():
+    fig, ax = plt.subplots()
+    with mock.patch.object(fig.canvas, "new_timer"):
+        yield Tooltip(ax)
+    plt.close(fig)
+
+
+def test_coalesce(tooltip):
+    tooltip.show("a", (1, 0))
+    tooltip.show("b", (2, 0))
+    tooltip.show("c", (3, 0))
+    tooltip.timer.start.assert_called_once()
+    tooltip.flush()
+    assert tooltip.annotation.get_text() == "c"
+    assert tooltip.annotation.xy == (3, 0)
+
+
+def test_reuse_annotation(tooltip):
+    annotation = tooltip.annotation
+    tooltip.show("a", (1, 0))
+    tooltip.flush()
+    tooltip.hide()
+    tooltip.flush()
+    tooltip.show("b", (2, 0))
+    tooltip.flush()
+    assert tooltip.annotation is annotation
+    assert list(tooltip.ax.texts) == [annotation]
+
+
+def test_unchanged_state_not_scheduled(tooltip):
+    tooltip.show("a", (1, 0))
+    tooltip.flush()
+    tooltip.show("a", (1, 0))
+    tooltip.timer.start.assert_called_once()
+
+
+def test_blit_cached_background(tooltip):
+    tooltip.ax.figure.canvas.draw()
+    assert tooltip.background is not None
+    with mock.patch.object(tooltip.canvas, "blit") as mock_blit:
+        tooltip.show("a", (1, 0))
+        tooltip.flush()
+        mock_blit.assert_called_once()
+
+
+def test_plotter_hover(active):
+    plotter = BoxPlotter(
+        active, "kr", categorical="school", annotate=("school", "kr")
+    )
+    plotter.plot()
+    with mock.patch.object(plotter.tooltip, "request") as mock_request:
+        plotter(Event(30799, 1))
+        mock_request.assert_called_once_with(("B\n30799", (30799, 1)))
+    plt.close(plotter.fig)
@@ -0,0 +1,129 @@
+import os
+from unittest import mock
+
+import pytest
+
+from catplot import main, watch
+
+
+@pytest.fixture
+def cfg(workdir):
+    return {
+        'data': 'export.csv', 'num': 'kr', 'cat': 'school',
+        'plot_type': 'box', 'no_cache': True,
+    }
+
+
+def touch(path, text):
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_first_step_renders(cfg, tmp_path):
+    watcher = watch.Watcher(cfg)
+    assert watcher.step(watcher.changed())
+    assert (tmp_path / 'box-kr-school.png').exists()
+    assert watcher.changed() == set()
+    assert not watcher.step(set())
+
+
+def test_corrections_without_reparse(cfg, tmp_path):
+    watcher = watch.Watcher(cfg)
+    watcher.step(watcher.changed())
+    touch(tmp_path / 'korr.csv', 'index,column,value\n0,kr,1\n')
+    with mock.patch('catplot.main.process_data') as process_data:
+        assert watcher.step(watcher.changed())
+    process_data.assert_not_called()
+    assert watcher.corrected.kr[0] == 1
+    assert watcher.raw.kr[0] != 1
+
+
+def test_settings_refilter(cfg, tmp_path):
+    settings = {**cfg, 'filters': ['km=F']}
+    watcher = watch.Watcher(cfg, settings=lambda: settings)
+    watcher.step(watcher.changed())
+    touch(tmp_path / 'config.ini', '[DEFAULT]\n')
+    with mock.patch('catplot.main.process_data') as process_data:
+        assert watcher.step(watcher.changed())
+    process_data.assert_not_called()
+    assert (tmp_path / 'box-kr-school-F.png').exists()
+
+
+def test_unchanged_settings(cfg, tmp_path):
+    watcher = watch.Watcher(cfg, settings=lambda: dict(cfg))
+    watcher.step(watcher.changed())
+    touch(tmp_path / 'config.ini', '[DEFAULT]\n')
+    assert not watcher.step(watcher.changed())
+
+
+def test_data_reparse(cfg, tmp_path, df):
+    watcher = watch.Watcher(cfg)
+    watcher.step(watcher.changed())
+    df.kr = 1
+    df.to_csv(tmp_path / 'export.csv', index=False)
+    touch(tmp_path / 'export.csv', (tmp_path / 'export.csv').read_text())
+    assert watcher.changed() == {'data'}
+    watcher.step({'data'})
+    assert (watcher.corrected.kr == 1).all()
+
+
+def test_display_in_place(cfg):
+    watcher = watch.Watcher({**cfg, 'display': True})
+    watcher.step(watcher.changed())
+    fig = watcher.ax.figure
+    callbacks = len(watch.connections(fig.canvas))
+    watcher.step({'korr'})
+    assert watcher.ax.figure is fig
+    assert len(watch.connections(fig.canvas)) == callbacks
+
+
+def test_watch_runs(cfg):
+    watcher = watch.watch(cfg, runs=1)
+    assert watcher.corrected is not None
+
+
+def test_bad_corrections_kept_watching(cfg, tmp_path):
+    watcher = watch.Watcher(cfg)
+    watcher.step(watcher.changed())
+    touch(tmp_path / 'korr.csv', 'row,column,value\n0,kr,1\n')
+    with pytest.raises(KeyError):
+        watcher.step(watcher.changed())
+    assert watcher.corrected is None
+    touch(tmp_path / 'korr.csv', 'index,column,value\n0,kr,1\n')
+    assert watcher.step(watcher.changed())
+    assert watcher.corrected.kr[0] == 1
+
+
+def test_watch_reports_errors(cfg, capsys):
+    step = watch.Watcher.step
+    failures = iter([ValueError('half saved')])
+
+    def fail_once(self, changed):
+        for error in failures:
+            self.signatures.clear()
+            raise error
+        return step(self, changed)
+
+    with mock.patch.object(watch.Watcher, 'step', fail_once):
+        watcher = watch.watch(cfg, interval=0.01, runs=1)
+    assert watcher.corrected is not None
+    assert 'ValueError: half saved' in capsys.readouterr().err
+
+
+def test_run_settings(monkeypatch):
+    monkeypatch.setattr(main, 'get_settings', lambda: {'num': ['a', 'b']})
+    assert main.run_settings() == {'num': ['a', 'b']}
+    monkeypatch.setattr(main, 'get_settings', lambda: {'num': ['a']})
+    assert main.run_settings() == {'num': 'a'}
+
+
+def test_new_snapshot(cfg, tmp_path, df):
+    df.to_csv(tmp_path / 'export-2.csv', index=False)
+    cfg['data'] = 'export*.csv'
+    watcher = watch.Watcher(cfg)
+    watcher.step(watcher.changed())
+    assert len(watcher.raw) == 2 * len(df)
+    assert watcher.changed() == set()
+    df.to_csv(tmp_path / 'export-3.csv', index=False)
+    assert watcher.changed() == {'data'}